@@ -51,15 +51,19 @@ import tm_state
 import tm_config
 from tm_ui import CommandCreatedHandler
 
+# Button definition and toolbar control created in run(), deleted in stop()
+_cmdDef = None
+_control = None
+
 
 def run(context):
     """Called when the add-in is loaded."""
+    global _cmdDef, _control
     try:
         tm_config.load_config()
 
         cmdDefs = tm_state._ui.commandDefinitions
-        addon_path = os.path.dirname(os.path.realpath(__file__))
-        resources_path = os.path.join(addon_path, 'resources', 'icons')
+        resources_path = os.path.join(_addin_path, 'resources', 'icons')
 
         buttonDef = cmdDefs.addButtonDefinition(
             tm_state.CMD_ID,
@@ -67,6 +71,7 @@ def run(context):
             tm_state.CMD_Description,
             resources_path
         )
+        _cmdDef = buttonDef
 
         onCommandCreated = CommandCreatedHandler()
         buttonDef.commandCreated.add(onCommandCreated)
@@ -77,6 +82,7 @@ def run(context):
             buttonControl = panel.controls.addCommand(buttonDef)
             buttonControl.isPromoted = True
             buttonControl.isPromotedByDefault = True
+            _control = buttonControl
         else:
             tm_state._ui.messageBox(f'Could not find panel: {tm_state.PANEL_ID}')
 
@@ -86,15 +92,31 @@ def run(context):
 
 def stop(context):
     """Called when the add-in is unloaded."""
+    global _cmdDef, _control
     try:
-        cmdDef = tm_state._ui.commandDefinitions.itemById(tm_state.CMD_ID)
-        if cmdDef:
-            cmdDef.deleteMe()
-
-        panel = tm_state._ui.allToolbarPanels.itemById(tm_state.PANEL_ID)
-        if panel:
-            control = panel.controls.itemById(tm_state.CMD_ID)
-            if control:
-                control.deleteMe()
+        # Delete the objects cached by run(); only look them up again if a
+        # reference went stale (e.g. run() failed half-way or the UI reset).
+        try:
+            _control.deleteMe()
+        except Exception:
+            panel = tm_state._ui.allToolbarPanels.itemById(tm_state.PANEL_ID)
+            if panel:
+                control = panel.controls.itemById(tm_state.CMD_ID)
+                if control:
+                    control.deleteMe()
+        _control = None
+
+        try:
+            _cmdDef.deleteMe()
+        except Exception:
+            cmdDef = tm_state._ui.commandDefinitions.itemById(tm_state.CMD_ID)
+            if cmdDef:
+                cmdDef.deleteMe()
+        _cmdDef = None
+
+        # Drop cached sketch frames; tm_geometry is only loaded once the command ran
+        tm_geometry = sys.modules.get('tm_geometry')
+        if tm_geometry:
+            tm_geometry.clear_sketch_frames()
     except Exception:
         tm_state._ui.messageBox('Failed to stop add-in:\n{}'.format(traceback.format_exc()))
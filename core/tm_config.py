@@ -4,104 +4,179 @@ tm_config.py – Configuration loading, validation, saving, and defaults.
 Reads/writes config.ini. Mutates INSERT_SPECS and CONFIG in tm_state.
 """
 import os
-import configparser
+import re
+import copy
 import tm_state
+import tm_helpers
+
+# Default CNC Kitchen insert specifications: name -> (hole_dia_mm, insert_len_mm, min_wall_mm)
+_DEFAULT_INSERTS = {
+    'M2 x 3mm': (3.2, 3.0, 1.5),
+    'M2.5 x 4mm': (4.0, 4.0, 1.5),
+    'M3 x 3mm (short)': (4.4, 3.0, 1.6),
+    'M3 x 4mm (short)': (4.4, 4.0, 1.6),
+    'M3 x 5.7mm (standard)': (4.4, 5.7, 1.6),
+    'M4 x 4mm (short)': (5.6, 4.0, 2.0),
+    'M4 x 8.1mm (standard)': (5.6, 8.1, 2.0),
+    'M5 x 5.8mm (short)': (6.4, 5.8, 2.5),
+    'M5 x 9.5mm (standard)': (6.4, 9.5, 2.5),
+    'M6 x 12.7mm': (8.0, 12.7, 3.0),
+    'M8 x 12.7mm': (9.7, 12.7, 4.0),
+    'M10 x 12.7mm': (12.0, 12.7, 5.0),
+    '1/4"-20 x 12.7mm (camera)': (8.0, 12.7, 3.0)
+}
+
+# Add-in root (one level up from core/) and config file location
+_ADDON_PATH = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+_CONFIG_FILE = os.path.join(_ADDON_PATH, 'config.ini')
+
+# Parsed result of the last load_config() call, keyed by config.ini mtime
+_config_cache = {'mtime': None, 'specs': None, 'cfg': None}
+
+
+# config.ini line grammar: "[Section]" headers and "key = value" pairs
+_SECTION_RE = re.compile(r'^\[([^\]]+)\]\s*$')
+_KV_RE = re.compile(r'^\s*([^#;=:\s\[][^=:]*?)\s*[=:]\s*(.*?)\s*$')
+
+# Boolean spellings accepted by configparser.getboolean()
+_BOOLEAN_STATES = {'1': True, 'yes': True, 'true': True, 'on': True,
+                   '0': False, 'no': False, 'false': False, 'off': False}
+
+
+def _parse_ini(config_file):
+    """
+    Parse config.ini into {section: {key: value}} with a single regex scan.
+
+    The file format is plain "[Section]" + "key = value" lines: no
+    interpolation, no multi-line values. Full-line '#'/';' comments and
+    lines outside a section are ignored. Keys keep their case. A leading
+    UTF-8 BOM (e.g. from Windows Notepad) is ignored, as configparser does.
+    """
+    sections = {}
+    current = None
+    with open(config_file, 'r', encoding='utf-8-sig') as f:
+        lines = f.read().splitlines()
+    for line in lines:
+        stripped = line.strip()
+        if not stripped or stripped[0] in '#;':
+            continue
+        match = _SECTION_RE.match(stripped)
+        if match:
+            current = sections.setdefault(match.group(1).strip(), {})
+            continue
+        if current is None:
+            continue
+        match = _KV_RE.match(line)
+        if match:
+            current[match.group(1)] = match.group(2)
+    return sections
+
+
+def _get_float(section, key, fallback):
+    """Return section[key] as float, or fallback if missing. Raises ValueError if malformed."""
+    value = section.get(key)
+    if value is None:
+        return fallback
+    return float(value)
+
+
+def _get_bool(section, key, fallback):
+    """Return section[key] as bool (configparser spellings), or fallback if missing."""
+    value = section.get(key)
+    if value is None:
+        return fallback
+    if value.lower() not in _BOOLEAN_STATES:
+        raise ValueError(f'Not a boolean: {value}')
+    return _BOOLEAN_STATES[value.lower()]
+
+
+def _read_float(settings, key, default, lo, hi, label, warnings, lo_inclusive=True):
+    """
+    Read a numeric [Settings] value, falling back to default if malformed or out of range.
+
+    Args:
+        settings: Parsed [Settings] section dict
+        key: Setting name
+        default: Value used when missing, malformed, or out of range
+        lo, hi: Accepted range in mm (hi inclusive; lo inclusive unless lo_inclusive=False)
+        label: Human-readable name used in the range warning
+        warnings: List that receives a message for every rejected value
+
+    Returns:
+        The validated float value.
+    """
+    try:
+        value = _get_float(settings, key, default)
+    except ValueError:
+        warnings.append(f'Invalid {key} value. Using default {default}mm.')
+        return default
+    if value > hi or value < lo or (value == lo and not lo_inclusive):
+        warnings.append(f'{label} {value}mm is unusual (expected {lo:g}-{hi:g}mm). Using default {default}mm.')
+        return default
+    return value
+
+
+def _read_bool(settings, key, default, warnings=None):
+    """Read a boolean [Settings] value; on a malformed value warn (if warnings given) and use default."""
+    try:
+        return _get_bool(settings, key, default)
+    except ValueError:
+        if warnings is not None:
+            warnings.append(f'Invalid {key} value. Using default {default}.')
+        return default
 
 
 def load_config():
     """Load configuration from config.ini with validation. Creates defaults if missing."""
-    addon_path = os.path.dirname(os.path.realpath(__file__))
-    addon_path = os.path.dirname(addon_path)  # Go up one level from core/
-    config_file = os.path.join(addon_path, 'config.ini')
+    config_file = _CONFIG_FILE
 
     if not os.path.exists(config_file):
         create_default_config()
 
+    # Reuse the previous parse if config.ini has not changed on disk
+    try:
+        mtime = os.stat(config_file).st_mtime_ns
+    except OSError:
+        mtime = None
+    if mtime is not None and _config_cache['mtime'] == mtime:
+        tm_state.INSERT_SPECS.clear()
+        tm_state.INSERT_SPECS.update(_config_cache['specs'])
+        tm_state.CONFIG.update(_config_cache['cfg'])
+        _apply_logging()
+        return tm_state.INSERT_SPECS, tm_state.CONFIG
+
     errors = []
     warnings = []
 
     try:
-        config = configparser.RawConfigParser()
-        config.optionxform = str  # Preserve case
-        config.read(config_file, encoding='utf-8')
-
-        if config.has_section('Settings'):
-            try:
-                chamfer = config.getfloat('Settings', 'chamfer_size', fallback=0.5)
-                if chamfer <= 0 or chamfer > 5.0:
-                    warnings.append(f'Chamfer size {chamfer}mm is unusual (expected 0-5mm). Using default 0.5mm.')
-                    chamfer = 0.5
-                tm_state.CONFIG['chamfer_size'] = chamfer
-            except ValueError:
-                warnings.append('Invalid chamfer_size value. Using default 0.5mm.')
-                tm_state.CONFIG['chamfer_size'] = 0.5
-
-            try:
-                extra_depth = config.getfloat('Settings', 'blind_hole_extra_depth', fallback=1.0)
-                if extra_depth < 0 or extra_depth > 10.0:
-                    warnings.append(f'Extra depth {extra_depth}mm is unusual (expected 0-10mm). Using default 1.0mm.')
-                    extra_depth = 1.0
-                tm_state.CONFIG['blind_hole_extra_depth'] = extra_depth
-            except ValueError:
-                warnings.append('Invalid blind_hole_extra_depth value. Using default 1.0mm.')
-                tm_state.CONFIG['blind_hole_extra_depth'] = 1.0
-
-            try:
-                tm_state.CONFIG['chamfer_enabled_default'] = config.getboolean('Settings', 'chamfer_enabled_default', fallback=True)
-            except ValueError:
-                warnings.append('Invalid chamfer_enabled_default value. Using default True.')
-                tm_state.CONFIG['chamfer_enabled_default'] = True
-
-            try:
-                bottom_radius = config.getfloat('Settings', 'bottom_radius_size', fallback=0.5)
-                if bottom_radius < 0 or bottom_radius > 5.0:
-                    warnings.append(f'Bottom radius {bottom_radius}mm is unusual (expected 0-5mm). Using default 0.5mm.')
-                    bottom_radius = 0.5
-                tm_state.CONFIG['bottom_radius_size'] = bottom_radius
-            except ValueError:
-                warnings.append('Invalid bottom_radius_size value. Using default 0.5mm.')
-                tm_state.CONFIG['bottom_radius_size'] = 0.5
-
-            try:
-                tm_state.CONFIG['bottom_radius_enabled_default'] = config.getboolean('Settings', 'bottom_radius_enabled_default', fallback=False)
-            except ValueError:
-                warnings.append('Invalid bottom_radius_enabled_default value. Using default False.')
-                tm_state.CONFIG['bottom_radius_enabled_default'] = False
-
-            try:
-                tm_state.CONFIG['show_success_message'] = config.getboolean('Settings', 'show_success_message', fallback=True)
-            except ValueError:
-                warnings.append('Invalid show_success_message value. Using default True.')
-                tm_state.CONFIG['show_success_message'] = True
-
-            try:
-                tm_state.CONFIG['hole_type_blind'] = config.getboolean('Settings', 'hole_type_blind', fallback=True)
-            except ValueError:
-                tm_state.CONFIG['hole_type_blind'] = True
-
-            try:
-                tm_state.CONFIG['enable_logging'] = config.getboolean('Settings', 'enable_logging', fallback=False)
-            except ValueError:
-                tm_state.CONFIG['enable_logging'] = False
-
-            try:
-                tm_state.CONFIG['enable_debug_export'] = config.getboolean('Settings', 'enable_debug_export', fallback=False)
-            except ValueError:
-                tm_state.CONFIG['enable_debug_export'] = False
-
-            try:
-                tm_state.CONFIG['last_selected_insert'] = config.get('Settings', 'last_selected_insert', fallback='M3 x 5.7mm (standard)')
-            except Exception:
-                tm_state.CONFIG['last_selected_insert'] = 'M3 x 5.7mm (standard)'
+        config = _parse_ini(config_file)
+
+        if 'Settings' in config:
+            settings = config['Settings']
+            cfg = tm_state.CONFIG
+            cfg['chamfer_size'] = _read_float(
+                settings, 'chamfer_size', 0.5, 0.0, 5.0, 'Chamfer size', warnings, lo_inclusive=False)
+            cfg['blind_hole_extra_depth'] = _read_float(
+                settings, 'blind_hole_extra_depth', 1.0, 0.0, 10.0, 'Extra depth', warnings)
+            cfg['bottom_radius_size'] = _read_float(
+                settings, 'bottom_radius_size', 0.5, 0.0, 5.0, 'Bottom radius', warnings)
+            cfg['chamfer_enabled_default'] = _read_bool(settings, 'chamfer_enabled_default', True, warnings)
+            cfg['bottom_radius_enabled_default'] = _read_bool(settings, 'bottom_radius_enabled_default', False, warnings)
+            cfg['show_success_message'] = _read_bool(settings, 'show_success_message', True, warnings)
+            cfg['hole_type_blind'] = _read_bool(settings, 'hole_type_blind', True)
+            cfg['enable_logging'] = _read_bool(settings, 'enable_logging', False)
+            cfg['log_level'] = settings.get('log_level', 'info').strip().lower()
+            if cfg['log_level'] not in tm_helpers.LOG_LEVELS:
+                warnings.append(f'Invalid log_level "{cfg["log_level"]}". Using default info.')
+                cfg['log_level'] = 'info'
+            cfg['enable_debug_export'] = _read_bool(settings, 'enable_debug_export', False)
+            cfg['last_selected_insert'] = settings.get('last_selected_insert', 'M3 x 5.7mm (standard)')
 
         # Load inserts
         tm_state.INSERT_SPECS.clear()
-        if config.has_section('Inserts'):
-            for name in config.options('Inserts'):
-                if name.startswith('#'):
-                    continue
+        if 'Inserts' in config:
+            for name, values in config['Inserts'].items():
                 try:
-                    values = config.get('Inserts', name)
                     if not values.strip() or values.strip().startswith('#'):
                         continue
                     parts = [x.strip() for x in values.split(',')]
@@ -131,7 +206,7 @@ def load_config():
 
         if not tm_state.INSERT_SPECS:
             errors.append('No valid inserts found in config.ini!')
-            tm_state.INSERT_SPECS.update(get_default_inserts())
+            tm_state.INSERT_SPECS.update(_DEFAULT_INSERTS)
             warnings.append('Using default CNC Kitchen specifications.')
 
         if errors or warnings:
@@ -143,27 +218,115 @@ def load_config():
             if tm_state._ui:
                 tm_state._ui.messageBox(f'Config.ini issues:\n\n{msg}')
 
+        _config_cache['mtime'] = mtime
+        _config_cache['specs'] = copy.deepcopy(tm_state.INSERT_SPECS)
+        _config_cache['cfg'] = copy.deepcopy(tm_state.CONFIG)
+
     except Exception as e:
         if tm_state._ui:
             tm_state._ui.messageBox(f'Error loading config.ini: {str(e)}\nUsing default specifications.')
-        tm_state.INSERT_SPECS.update(get_default_inserts())
+        tm_state.INSERT_SPECS.update(_DEFAULT_INSERTS)
 
+    _apply_logging()
     return tm_state.INSERT_SPECS, tm_state.CONFIG
 
 
+def _apply_logging():
+    """Push the logging settings from CONFIG to tm_helpers.log()."""
+    tm_helpers.set_log_enabled(tm_state.CONFIG['enable_logging'])
+    tm_helpers.set_log_level(tm_state.CONFIG['log_level'])
+
+
+def _write_settings(config_file, updates):
+    """
+    Rewrite only the given [Settings] keys in config.ini, in a single pass.
+
+    Lines are replaced in place so comments and the [Inserts] table are kept
+    untouched. Keys not yet present are appended to the [Settings] section
+    (which is created if missing). The file is written atomically, and the
+    load_config() cache is kept valid (see _refresh_config_cache()).
+
+    Args:
+        config_file: Path to config.ini
+        updates: dict of key -> value (values are written with str())
+    """
+    try:
+        old_mtime = os.stat(config_file).st_mtime_ns
+        with open(config_file, 'r', encoding='utf-8-sig') as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        old_mtime = None
+        lines = []
+
+    pending = {key: str(value) for key, value in updates.items()}
+    key_res = {key: re.compile(rf'\s*{re.escape(key)}\s*[=:]') for key in pending}
+
+    in_settings = False
+    settings_end = None  # index after the last non-blank line of [Settings]
+    for i, line in enumerate(lines):
+        stripped = line.strip()
+        if stripped.startswith('[') and stripped.endswith(']'):
+            in_settings = stripped[1:-1].strip() == 'Settings'
+            if in_settings:
+                settings_end = i + 1
+            continue
+        if not in_settings:
+            continue
+        if stripped:
+            settings_end = i + 1
+        for key in list(pending):
+            if key_res[key].match(line):
+                lines[i] = f'{key} = {pending.pop(key)}'
+                break
+
+    if pending:
+        missing = [f'{key} = {value}' for key, value in pending.items()]
+        if settings_end is None:
+            lines[0:0] = ['[Settings]'] + missing + ['']
+        else:
+            lines[settings_end:settings_end] = missing
+
+    tmp_file = config_file + '.tmp'
+    try:
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
+        os.replace(tmp_file, config_file)
+    except Exception:
+        # Don't leave a stray config.ini.tmp next to the real file
+        try:
+            os.remove(tmp_file)
+        except OSError:
+            pass
+        raise
+    _refresh_config_cache(config_file, old_mtime, updates)
+
+
+def _refresh_config_cache(config_file, old_mtime, updates):
+    """
+    Carry the load_config() cache over a settings write.
+
+    Every execute saves the dialog state, so without this the next dialog
+    open would always see a new mtime and reparse config.ini. The cache is
+    only updated if it matched the file as it was before the write;
+    otherwise it is dropped.
+    """
+    if config_file != _CONFIG_FILE or _config_cache['mtime'] is None:
+        return
+    if _config_cache['mtime'] != old_mtime:
+        _config_cache['mtime'] = None
+        return
+    try:
+        _config_cache['mtime'] = os.stat(config_file).st_mtime_ns
+    except OSError:
+        _config_cache['mtime'] = None
+        return
+    _config_cache['cfg'].update(updates)
+
+
 def save_last_selected_insert(insert_name):
     """Persist the last selected insert name to config.ini."""
     try:
-        addon_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-        config_file = os.path.join(addon_path, 'config.ini')
-        config = configparser.RawConfigParser()
-        config.optionxform = str
-        config.read(config_file, encoding='utf-8')
-        if not config.has_section('Settings'):
-            config.add_section('Settings')
-        config.set('Settings', 'last_selected_insert', insert_name)
-        with open(config_file, 'w', encoding='utf-8') as f:
-            config.write(f)
+        _write_settings(_CONFIG_FILE, {'last_selected_insert': insert_name})
     except Exception:
         pass
 
@@ -171,83 +334,69 @@ def save_last_selected_insert(insert_name):
 def save_checkbox_states(chamfer_state, radius_state, show_message_state, is_blind_hole):
     """Persist UI checkbox states and hole type to config.ini."""
     try:
-        addon_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-        config_file = os.path.join(addon_path, 'config.ini')
-        config = configparser.RawConfigParser()
-        config.optionxform = str
-        config.read(config_file, encoding='utf-8')
-        if not config.has_section('Settings'):
-            config.add_section('Settings')
-        config.set('Settings', 'chamfer_enabled_default', str(chamfer_state))
-        config.set('Settings', 'bottom_radius_enabled_default', str(radius_state))
-        config.set('Settings', 'show_success_message', str(show_message_state))
-        config.set('Settings', 'hole_type_blind', str(is_blind_hole))
-        with open(config_file, 'w', encoding='utf-8') as f:
-            config.write(f)
+        _write_settings(_CONFIG_FILE, {
+            'chamfer_enabled_default': chamfer_state,
+            'bottom_radius_enabled_default': radius_state,
+            'show_success_message': show_message_state,
+            'hole_type_blind': is_blind_hole,
+        })
     except Exception:
         pass
 
 
 def get_default_inserts():
-    """Return the default CNC Kitchen insert specifications."""
-    return {
-        'M2 x 3mm': (3.2, 3.0, 1.5),
-        'M2.5 x 4mm': (4.0, 4.0, 1.5),
-        'M3 x 3mm (short)': (4.4, 3.0, 1.6),
-        'M3 x 4mm (short)': (4.4, 4.0, 1.6),
-        'M3 x 5.7mm (standard)': (4.4, 5.7, 1.6),
-        'M4 x 4mm (short)': (5.6, 4.0, 2.0),
-        'M4 x 8.1mm (standard)': (5.6, 8.1, 2.0),
-        'M5 x 5.8mm (short)': (6.4, 5.8, 2.5),
-        'M5 x 9.5mm (standard)': (6.4, 9.5, 2.5),
-        'M6 x 12.7mm': (8.0, 12.7, 3.0),
-        'M8 x 12.7mm': (9.7, 12.7, 4.0),
-        'M10 x 12.7mm': (12.0, 12.7, 5.0),
-        '1/4"-20 x 12.7mm (camera)': (8.0, 12.7, 3.0)
-    }
+    """Return a copy of the default CNC Kitchen insert specifications."""
+    return dict(_DEFAULT_INSERTS)
 
 
 def create_default_config():
     """Write a default config.ini file."""
-    addon_path = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
-    config_file = os.path.join(addon_path, 'config.ini')
+    lines = [
+        '[Settings]',
+        '# Default chamfer size in mm',
+        'chamfer_size = 0.5',
+        '',
+        '# Extra depth added to blind holes in mm (recommended: 1.0mm)',
+        'blind_hole_extra_depth = 1.0',
+        '',
+        '# Default chamfer checkbox state (True or False)',
+        'chamfer_enabled_default = True',
+        '',
+        '# Bottom radius size for blind holes in mm (for rounding the bottom edge)',
+        'bottom_radius_size = 0.5',
+        '',
+        '# Default bottom radius checkbox state (True or False)',
+        'bottom_radius_enabled_default = False',
+        '',
+        '# Show success message after operation (True or False)',
+        'show_success_message = True',
+        '',
+        '# Enable logging to Fusion TextCommands console (True or False)',
+        'enable_logging = False',
+        '',
+        '# Log detail when logging is enabled: info, or debug for per-hole diagnostics',
+        'log_level = info',
+        '',
+        '# Enable debug JSON export button in dialog (developer/support feature)',
+        'enable_debug_export = False',
+        '',
+        '# Last selected insert (will be remembered between sessions)',
+        'last_selected_insert = M3 x 5.7mm (standard)',
+        '',
+        '',
+        '[Inserts]',
+    ]
+    lines += [f'{name} = {dia}, {length}, {wall}'
+              for name, (dia, length, wall) in _DEFAULT_INSERTS.items()]
+    lines += [
+        '',
+        '# Add your custom inserts below:',
+        '# My Custom M3 = 4.5, 6.0, 1.6',
+        '# My Custom M4 = 5.7, 9.0, 2.0',
+    ]
     try:
-        with open(config_file, 'w', encoding='utf-8') as f:
-            f.write('[Settings]\n')
-            f.write('# Default chamfer size in mm\n')
-            f.write('chamfer_size = 0.5\n')
-            f.write('\n')
-            f.write('# Extra depth added to blind holes in mm (recommended: 1.0mm)\n')
-            f.write('blind_hole_extra_depth = 1.0\n')
-            f.write('\n')
-            f.write('# Default chamfer checkbox state (True or False)\n')
-            f.write('chamfer_enabled_default = True\n')
-            f.write('\n')
-            f.write('# Bottom radius size for blind holes in mm (for rounding the bottom edge)\n')
-            f.write('bottom_radius_size = 0.5\n')
-            f.write('\n')
-            f.write('# Default bottom radius checkbox state (True or False)\n')
-            f.write('bottom_radius_enabled_default = False\n')
-            f.write('\n')
-            f.write('# Show success message after operation (True or False)\n')
-            f.write('show_success_message = True\n')
-            f.write('\n')
-            f.write('# Enable logging to Fusion TextCommands console (True or False)\n')
-            f.write('enable_logging = False\n')
-            f.write('\n')
-            f.write('# Enable debug JSON export button in dialog (developer/support feature)\n')
-            f.write('enable_debug_export = False\n')
-            f.write('\n')
-            f.write('# Last selected insert (will be remembered between sessions)\n')
-            f.write('last_selected_insert = M3 x 5.7mm (standard)\n')
-            f.write('\n\n')
-            f.write('[Inserts]\n')
-            for name, (dia, length, wall) in get_default_inserts().items():
-                f.write(f'{name} = {dia}, {length}, {wall}\n')
-            f.write('\n')
-            f.write('# Add your custom inserts below:\n')
-            f.write('# My Custom M3 = 4.5, 6.0, 1.6\n')
-            f.write('# My Custom M4 = 5.7, 9.0, 2.0\n')
+        with open(_CONFIG_FILE, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(lines) + '\n')
     except Exception as e:
         if tm_state._ui:
             tm_state._ui.messageBox(f'Could not create config.ini: {str(e)}')
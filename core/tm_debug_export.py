@@ -16,28 +16,40 @@ import adsk.fusion
 from tm_geometry import findProfileForCircle
 
 
+# Console lines collected during one export, written by _flush_debug_log()
+_debug_lines = []
+
+
 def _debug_log(msg):
-    """Write directly to Fusion console (for debug export, independent of enable_logging flag)."""
+    """Queue a line for the Fusion console (for debug export, independent of enable_logging flag)."""
+    _debug_lines.append(str(msg))
+
+
+def _flush_debug_log():
+    """Write all queued lines to the Fusion console in a single writeText() call."""
+    if not _debug_lines:
+        return
+    text = "\n".join(_debug_lines)
+    del _debug_lines[:]
     try:
         app = adsk.core.Application.get()
         ui = app.userInterface
         p = ui.palettes.itemById('TextCommands')
         if not p.isVisible:
             p.isVisible = True
-        p.writeText(str(msg))
+        p.writeText(text)
     except Exception:
         pass
 
 
 def _clear_debug_log():
-    """Clear console for debug export."""
+    """Clear console for debug export by scrolling it with one block of blank lines."""
     try:
         app = adsk.core.Application.get()
         ui = app.userInterface
         p = ui.palettes.itemById('TextCommands')
         if p:
-            for _ in range(50):
-                p.writeText('')
+            p.writeText('\n' * 49)
             if not p.isVisible:
                 p.isVisible = True
     except Exception:
@@ -49,7 +61,8 @@ def export_sketch_data(sketch, target_circle, output_dir, description=""):
     Export sketch profiles and target circle to JSON fixture.
 
     Dual output mode:
-    - Console: [EXPORT] progress messages to Fusion TextCommands
+    - Console: [EXPORT] progress messages to Fusion TextCommands, written
+      in one batch when the export finishes or fails
     - File: JSON fixture to debug_exports/
 
     Args:
@@ -61,6 +74,7 @@ def export_sketch_data(sketch, target_circle, output_dir, description=""):
     Returns:
         str: Path to created JSON file
     """
+    del _debug_lines[:]
     try:
         _clear_debug_log()
         _debug_log(f"[EXPORT] Starting: {description}")
@@ -155,6 +169,9 @@ def export_sketch_data(sketch, target_circle, output_dir, description=""):
         _debug_log(f"[EXPORT] FAILED: {str(e)}")
         raise
 
+    finally:
+        _flush_debug_log()
+
 
 def _extract_ellipse_params(sketch_entity, type_name):
     """Extract major/minor axis lengths and rotation from an ellipse or elliptical arc entity.
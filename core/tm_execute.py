@@ -4,16 +4,51 @@ tm_execute.py – CommandExecuteHandler: orchestrates the hole creation loop.
 import adsk.core, adsk.fusion, traceback, os
 import tm_state
 import tm_config
-from tm_helpers import calc_blind_hole_depth
+from tm_helpers import calc_blind_hole_depth, point_key, object_collection, log, DEBUG
 from tm_geometry import (
     findProfileForCircle,
     findExtrudeDirectionFromSketch,
     findChamferEdge,
-    addChamferToEdge,
+    addChamferToEdges,
     findDistanceThroughBody,
-    addBottomRadiusToBlindHole,
+    findBottomEdge,
+    flushPendingFillets,
+    snapshot_circular_edges,
+    clear_sketch_frames,
 )
 
+_CUT_OPERATION = adsk.fusion.FeatureOperations.CutFeatureOperation
+_OBJECT_COLLECTION = adsk.core.ObjectCollection
+
+
+def _cutProfiles(extrudes, profiles, direction, distance, targetBody):
+    """
+    Cut all given profiles into targetBody with a single extrude feature.
+
+    Args:
+        extrudes: ExtrudeFeatures collection of the target component
+        profiles: List of Profiles or ObjectCollections of Profiles
+        direction: ExtentDirections value for the one-sided extent
+        distance: Cut distance in cm
+        targetBody: Body the cut is limited to
+
+    Returns:
+        The created ExtrudeFeature
+    """
+    flat = []
+    for profile in profiles:
+        if isinstance(profile, _OBJECT_COLLECTION):
+            flat.extend(profile.item(i) for i in range(profile.count))
+        else:
+            flat.append(profile)
+
+    extInput = extrudes.createInput(object_collection(flat), _CUT_OPERATION)
+    dist = adsk.core.ValueInput.createByReal(distance)
+    extent = adsk.fusion.DistanceExtentDefinition.create(dist)
+    extInput.setOneSideExtent(extent, direction)
+    extInput.participantBodies = [targetBody]
+    return extrudes.add(extInput)
+
 
 class CommandExecuteHandler(adsk.core.CommandEventHandler):
     def notify(self, args):
@@ -29,8 +64,27 @@ class CommandExecuteHandler(adsk.core.CommandEventHandler):
             exportDebugInput = inputs.itemById('exportDebug')
             shouldExport = exportDebugInput is not None and exportDebugInput.value
 
+            # Sketch planes may have moved since the last run
+            clear_sketch_frames()
+
             targetBody = bodySelect.selection(0).entity
-            selectedPoints = [pointSelect.selection(i).entity for i in range(pointSelect.selectionCount)]
+            # Selected points grouped by parent sketch, keeping selection
+            # order (and index, for temp sketch names) within each sketch
+            sketchPoints = {}
+            sketches = {}
+            seenPoints = set()
+            for i in range(pointSelect.selectionCount):
+                point = pointSelect.selection(i).entity
+                # Coincident points (e.g. from two sketches) would cut the same hole twice
+                key = point_key(point.worldGeometry)
+                if key not in seenPoints:
+                    seenPoints.add(key)
+                    parentSketch = point.parentSketch
+                    token = parentSketch.entityToken
+                    # Points of one sketch share one sketch object and reference plane
+                    if token not in sketches:
+                        sketches[token] = (parentSketch, parentSketch.referencePlane)
+                    sketchPoints.setdefault(token, []).append((i, point, sketches[token]))
 
             insertName = insertSize.selectedItem.name
             tm_config.save_last_selected_insert(insertName)
@@ -46,6 +100,12 @@ class CommandExecuteHandler(adsk.core.CommandEventHandler):
             radius = holeDia / 2.0 / 10.0   # mm -> cm
             diameter = radius * 2.0
 
+            config = tm_state.CONFIG
+            chamferSize = config['chamfer_size']
+            bottomRadiusSize = config['bottom_radius_size']
+            if isBlindHole:
+                holeDepth = calc_blind_hole_depth(insertLen, config['blind_hole_extra_depth'])
+
             successCount = 0
             failedCount = 0
 
@@ -59,15 +119,38 @@ class CommandExecuteHandler(adsk.core.CommandEventHandler):
                 if timeline and timeline.count > 0:
                     startIndex = timeline.markerPosition
 
-            for point_idx, point in enumerate(selectedPoints):
-                parentSketch = point.parentSketch
+            # Phase 1: read-only probes. Resolve direction and cut distance
+            # for every point before any sketch is created, so points that
+            # miss the body never get a temp sketch.
+            probed = []
+            for point_idx, point, sketchInfo in (entry for points in sketchPoints.values() for entry in points):
+                parentSketch = sketchInfo[0]
                 center2d = point.geometry
 
+                direction = findExtrudeDirectionFromSketch(parentSketch, center2d, targetBody)
+
+                if direction is None:
+                    failedCount += 1
+                    continue
+
+                if isBlindHole:
+                    distance = holeDepth
+                else:
+                    distance = findDistanceThroughBody(parentSketch, center2d, targetBody, direction)
+
+                probed.append((point_idx, point, sketchInfo, center2d, direction, distance))
+
+            # Phase 2: one clean temp sketch + bore circle per point
+            holes = []
+            for point_idx, point, (parentSketch, face), center2d, direction, distance in probed:
                 # Create clean sketch without auto-projected body edges
-                face = parentSketch.referencePlane
                 tempSketch = component.sketches.addWithoutEdges(face)
                 tempSketch.name = f"TM_{insertName}_P{point_idx+1}"
 
+                # Defer solving while the projection, circle and constraint
+                # are added; re-enabling computes the sketch once
+                tempSketch.isComputeDeferred = True
+
                 # Project original point to maintain parametric association
                 projectedEntities = tempSketch.project(point)
                 projectedPoint = projectedEntities.item(0)
@@ -78,6 +161,8 @@ class CommandExecuteHandler(adsk.core.CommandEventHandler):
                 tempConstraints = tempSketch.geometricConstraints
                 tempConstraints.addCoincident(circle.centerSketchPoint, projectedPoint)
 
+                tempSketch.isComputeDeferred = False
+
                 profile_or_collection = findProfileForCircle(tempSketch, circle)
 
                 if profile_or_collection is None:
@@ -99,42 +184,80 @@ class CommandExecuteHandler(adsk.core.CommandEventHandler):
                     except Exception:
                         pass
 
-                direction = findExtrudeDirectionFromSketch(parentSketch, center2d, targetBody)
+                holes.append((parentSketch, center2d, profile_or_collection, direction, distance, tempSketch))
 
-                if direction is None:
-                    failedCount += 1
-                    tempSketch.deleteMe()
-                    continue
+            # Phase 3: one cut per (sketch plane, direction, distance) group
+            # instead of one per point.
+            groups = {}
+            for hole in holes:
+                parentSketch, _, _, direction, distance, _ = hole
+                key = (parentSketch.entityToken, direction, round(distance, 6))
+                groups.setdefault(key, []).append(hole)
 
-                extrudes = component.features.extrudeFeatures
-                extInput = extrudes.createInput(profile_or_collection, adsk.fusion.FeatureOperations.CutFeatureOperation)
-
-                if isBlindHole:
-                    holeDepth = calc_blind_hole_depth(insertLen, tm_state.CONFIG['blind_hole_extra_depth'])
-                    dist = adsk.core.ValueInput.createByReal(holeDepth)
-                    extent = adsk.fusion.DistanceExtentDefinition.create(dist)
-                    extInput.setOneSideExtent(extent, direction)
-                else:
-                    throughDistance = findDistanceThroughBody(parentSketch, center2d, targetBody, direction)
-                    dist = adsk.core.ValueInput.createByReal(throughDistance)
-                    extent = adsk.fusion.DistanceExtentDefinition.create(dist)
-                    extInput.setOneSideExtent(extent, direction)
-
-                extInput.participantBodies = [targetBody]
-                extrude = extrudes.add(extInput)
+            extrudes = component.features.extrudeFeatures
+            cutHoles = []
+            for groupHoles in groups.values():
+                direction = groupHoles[0][3]
+                distance = groupHoles[0][4]
+                try:
+                    extrude = _cutProfiles(
+                        extrudes, [hole[2] for hole in groupHoles], direction, distance, targetBody)
+                    cutHoles.extend((hole, extrude) for hole in groupHoles)
+                except Exception as e:
+                    # A combined cut can be rejected where single cuts succeed;
+                    # fall back to one extrude per hole for this group.
+                    log("Cut of %d holes rejected (%r), retrying per hole", len(groupHoles), e, level=DEBUG)
+                    for hole in groupHoles:
+                        try:
+                            extrude = _cutProfiles(extrudes, [hole[2]], direction, distance, targetBody)
+                            cutHoles.append((hole, extrude))
+                        except Exception as e:
+                            log("Cut failed: %r", e, level=DEBUG)
+                            failedCount += 1
+                            # Don't leave the unused temp sketch in the timeline
+                            try:
+                                hole[5].deleteMe()
+                            except Exception:
+                                pass
 
-                if includeChamfer:
-                    chamferEdge = findChamferEdge(extrude, targetBody, parentSketch, center2d, diameter)
+            # Phase 4: locate all chamfer edges first, then chamfer them in
+            # one feature.
+            if includeChamfer:
+                chamferEdges = []
+                snapshots = {}
+                for (parentSketch, center2d, _, _, _, _), extrude in cutHoles:
+                    snapshot = snapshots.get(id(extrude))
+                    if snapshot is None:
+                        snapshot = snapshot_circular_edges(extrude, targetBody, radius)
+                        snapshots[id(extrude)] = snapshot
+                    chamferEdge = findChamferEdge(
+                        extrude, targetBody, parentSketch, center2d, diameter, snapshot)
                     if chamferEdge:
-                        addChamferToEdge(component, chamferEdge, tm_state.CONFIG['chamfer_size'])
+                        chamferEdges.append(chamferEdge)
+                if chamferEdges:
+                    addChamferToEdges(component, chamferEdges, chamferSize)
 
-                if includeBottomRadius:
-                    addBottomRadiusToBlindHole(
-                        component, extrude, targetBody, parentSketch, center2d,
-                        diameter, tm_state.CONFIG['bottom_radius_size']
-                    )
+            # Phase 5: queue bottom edges by fillet radius, then fillet each
+            # radius group in one feature.
+            if includeBottomRadius:
+                pendingFillets = {}
+                # Chamfers changed the body, so snapshot the cuts afresh
+                snapshots = {}
+                for (parentSketch, center2d, _, _, _, _), extrude in cutHoles:
+                    snapshot = snapshots.get(id(extrude))
+                    if snapshot is None:
+                        snapshot = snapshot_circular_edges(extrude, targetBody, radius)
+                        snapshots[id(extrude)] = snapshot
+                    bottomEdge = findBottomEdge(
+                        extrude, targetBody, parentSketch, center2d, diameter, snapshot)
+                    if bottomEdge:
+                        # The snapshot already holds the edge's radius
+                        edgeRadius = next(rec.radius for rec in snapshot if rec.edge is bottomEdge)
+                        pendingFillets.setdefault(bottomRadiusSize / 10.0, []).append(
+                            (bottomEdge, edgeRadius))
+                flushPendingFillets(component, pendingFillets)
 
-                successCount += 1
+            successCount = len(cutHoles)
 
             if successCount > 0 and timeline is not None and startIndex >= 0:
                 try:
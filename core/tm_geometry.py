@@ -3,51 +3,65 @@ tm_geometry.py – All geometry functions: profile finding, extrusion direction,
 chamfer, fillet, and through-body distance.
 """
 import adsk.core, adsk.fusion, traceback
-import math
-from itertools import combinations
+from bisect import bisect_left
+from collections import namedtuple
+from operator import itemgetter
 import tm_state
+from tm_helpers import log, DEBUG, object_collection
 
 # Profile point margin: profiles must have ALL endpoints within circle_radius * (1 + this margin)
 PROFILE_POINT_MARGIN = 0.05
 
+# API enum values, bound once instead of walking adsk.* per use
+_MEDIUM_ACCURACY = adsk.fusion.CalculationAccuracy.MediumCalculationAccuracy
+_CIRCLE_3D = adsk.core.Curve3DTypes.Circle3DCurveType
+_INSIDE = adsk.fusion.PointContainment.PointInsidePointContainment
+_ON = adsk.fusion.PointContainment.PointOnPointContainment
+_OUTSIDE = adsk.fusion.PointContainment.PointOutsidePointContainment
+_POSITIVE = adsk.fusion.ExtentDirections.PositiveExtentDirection
+_NEGATIVE = adsk.fusion.ExtentDirections.NegativeExtentDirection
+_FACE_ENTITY = adsk.fusion.BRepEntityTypes.BRepFaceEntityType
 
-def _filter_by_area(sketch, target_area):
-    """
-    Coarse area filter: select profiles whose area <= target_area * 1.01.
+# Circle data of one BRep edge, read once by snapshot_circular_edges()
+EdgeRec = namedtuple('EdgeRec', 'edge radius nx ny nz cx cy cz')
 
-    Returns:
-        List of (profile, area) tuples passing the area filter.
-    """
-    candidates = []
-    threshold = target_area * 1.01
-    for idx, prof in enumerate(sketch.profiles):
-        props = prof.areaProperties(adsk.fusion.CalculationAccuracy.MediumCalculationAccuracy)
-        if props.area <= threshold:
-            candidates.append((prof, props.area))
-    return candidates
+# Sketch entity classes dispatched on per profile curve
+_SKETCH_LINE = adsk.fusion.SketchLine
+_SKETCH_ARC = adsk.fusion.SketchArc
+_SKETCH_CIRCLE = adsk.fusion.SketchCircle
+_SKETCH_ELLIPTICAL_ARC = adsk.fusion.SketchEllipticalArc
+_SKETCH_ELLIPSE = adsk.fusion.SketchEllipse
 
 
-def _filter_by_centroid(candidates, circle_center3d, circle_radius):
+def _filter_coarse(sketch, target_area, circle_center3d, circle_radius):
     """
-    Coarse centroid filter: check if profile centroid is inside target circle.
+    Single-pass area + centroid filter over all sketch profiles.
 
-    Args:
-        candidates: List of (profile, area) tuples from area filter
-        circle_center3d: 3D center point of target circle
-        circle_radius: Radius of target circle
+    Keeps profiles whose area is at most target_area * 1.01 and whose
+    centroid lies inside the target circle. areaProperties() is queried
+    once per profile.
 
     Returns:
-        List of (profile, area, centroid_distance) tuples passing centroid filter.
+        List of (profile, area, centroid_d2) tuples passing both filters,
+        where centroid_d2 is the squared centroid distance.
     """
     filtered = []
-    for idx, (prof, area) in enumerate(candidates):
-        props = prof.areaProperties(adsk.fusion.CalculationAccuracy.MediumCalculationAccuracy)
+    threshold = target_area * 1.01
+    accuracy = _MEDIUM_ACCURACY
+    cx, cy, cz = circle_center3d.x, circle_center3d.y, circle_center3d.z
+    r2 = circle_radius * circle_radius
+    for prof in sketch.profiles:
+        props = prof.areaProperties(accuracy)
+        area = props.area
+        if area > threshold:
+            continue
         centroid3d = props.centroid
-        distance = circle_center3d.distanceTo(centroid3d)
-
-        if distance <= circle_radius:
-            filtered.append((prof, area, distance))
-
+        dx = centroid3d.x - cx
+        dy = centroid3d.y - cy
+        dz = centroid3d.z - cz
+        d2 = dx * dx + dy * dy + dz * dz
+        if d2 <= r2:
+            filtered.append((prof, area, d2))
     return filtered
 
 
@@ -61,17 +75,19 @@ def _filter_by_curve_points(candidates, circle_center3d, circle_radius):
     - If no non-construction curves exist, falls back to centroid check
 
     Args:
-        candidates: List of (profile, area, distance) tuples from centroid filter
+        candidates: List of (profile, area, centroid_d2) tuples from centroid filter
         circle_center3d: 3D center point of target circle
         circle_radius: Radius of target circle
 
     Returns:
-        List of (profile, area, distance) tuples passing curve-point filter.
+        List of (profile, area, centroid_d2) tuples passing curve-point filter.
     """
     filtered = []
     acceptance_radius = circle_radius * (1 + PROFILE_POINT_MARGIN)
+    acceptance_r2 = acceptance_radius * acceptance_radius
+    cx, cy, cz = circle_center3d.x, circle_center3d.y, circle_center3d.z
 
-    for idx, (prof, area, centroid_distance) in enumerate(candidates):
+    for idx, (prof, area, centroid_d2) in enumerate(candidates):
         all_points_inside = True
         has_non_construction = False
 
@@ -89,34 +105,36 @@ def _filter_by_curve_points(candidates, circle_center3d, circle_radius):
                     has_non_construction = True
                     points_to_check = []
 
-                    if isinstance(sketch_entity, adsk.fusion.SketchLine):
+                    if isinstance(sketch_entity, _SKETCH_LINE):
                         start_pt = sketch_entity.startSketchPoint.geometry
                         end_pt = sketch_entity.endSketchPoint.geometry
                         points_to_check = [start_pt, end_pt]
 
-                    elif isinstance(sketch_entity, adsk.fusion.SketchArc):
+                    elif isinstance(sketch_entity, _SKETCH_ARC):
                         center_pt = sketch_entity.centerSketchPoint.geometry
                         start_pt = sketch_entity.startSketchPoint.geometry
                         end_pt = sketch_entity.endSketchPoint.geometry
                         points_to_check = [center_pt, start_pt, end_pt]
 
-                    elif isinstance(sketch_entity, adsk.fusion.SketchCircle):
+                    elif isinstance(sketch_entity, _SKETCH_CIRCLE):
                         center_pt = sketch_entity.centerSketchPoint.geometry
                         points_to_check = [center_pt]
 
-                    elif isinstance(sketch_entity, adsk.fusion.SketchEllipticalArc):
+                    elif isinstance(sketch_entity, _SKETCH_ELLIPTICAL_ARC):
                         center_pt = sketch_entity.centerSketchPoint.geometry
                         start_pt = sketch_entity.startSketchPoint.geometry
                         end_pt = sketch_entity.endSketchPoint.geometry
                         points_to_check = [center_pt, start_pt, end_pt]
 
-                    elif isinstance(sketch_entity, adsk.fusion.SketchEllipse):
+                    elif isinstance(sketch_entity, _SKETCH_ELLIPSE):
                         center_pt = sketch_entity.centerSketchPoint.geometry
                         points_to_check = [center_pt]
 
                     for pt in points_to_check:
-                        distance = circle_center3d.distanceTo(pt)
-                        if distance > acceptance_radius:
+                        dx = pt.x - cx
+                        dy = pt.y - cy
+                        dz = pt.z - cz
+                        if dx * dx + dy * dy + dz * dz > acceptance_r2:
                             all_points_inside = False
                             break
 
@@ -130,9 +148,9 @@ def _filter_by_curve_points(candidates, circle_center3d, circle_radius):
             has_non_construction = False
 
         if not has_non_construction:
-            filtered.append((prof, area, centroid_distance))
+            filtered.append((prof, area, centroid_d2))
         elif all_points_inside:
-            filtered.append((prof, area, centroid_distance))
+            filtered.append((prof, area, centroid_d2))
 
     return filtered
 
@@ -142,12 +160,12 @@ def _filter_by_bounding_box(candidates, circle_center3d, circle_radius):
     Coarse bounding box filter: check if profile bbox fits in generous circle area.
 
     Args:
-        candidates: List of (profile, area, distance) tuples from centroid filter
+        candidates: List of (profile, area, centroid_d2) tuples from centroid filter
         circle_center3d: 3D center point of target circle
         circle_radius: Radius of target circle
 
     Returns:
-        List of (profile, area, distance) tuples passing bbox filter.
+        List of (profile, area, centroid_d2) tuples passing bbox filter.
     """
     bbox_margin = circle_radius * 0.1
     circle_bbox_min_x = circle_center3d.x - circle_radius - bbox_margin
@@ -156,7 +174,7 @@ def _filter_by_bounding_box(candidates, circle_center3d, circle_radius):
     circle_bbox_max_y = circle_center3d.y + circle_radius + bbox_margin
 
     filtered = []
-    for prof, area, distance in candidates:
+    for prof, area, centroid_d2 in candidates:
         prof_bbox = prof.boundingBox
         is_contained = (
             prof_bbox.minPoint.x >= circle_bbox_min_x and
@@ -166,43 +184,99 @@ def _filter_by_bounding_box(candidates, circle_center3d, circle_radius):
         )
 
         if is_contained:
-            filtered.append((prof, area, distance))
+            filtered.append((prof, area, centroid_d2))
     return filtered
 
 
+def _subset_sums(areas, offset, limit, max_count):
+    """
+    Enumerate subsets of areas whose sum stays within limit.
+
+    Args:
+        areas: List of areas, sorted descending
+        offset: Index of areas[0] in the full candidate list
+        limit: Maximum allowed subset sum (larger partial sums are pruned)
+        max_count: Maximum number of items per subset
+
+    Returns:
+        List of (area_sum, index_tuple) including the empty subset.
+    """
+    subsets = [(0.0, ())]
+    for i, area in enumerate(areas):
+        extended = []
+        for subset_sum, indices in subsets:
+            new_sum = subset_sum + area
+            if new_sum <= limit and len(indices) < max_count:
+                extended.append((new_sum, indices + (offset + i,)))
+        subsets.extend(extended)
+    return subsets
+
+
 def _accumulate_profiles(candidates, target_area):
     """
     Precise area matching: find profile combination with area closest to target.
-    Uses combinatorial search with 15-profile cap.
+
+    Meet-in-the-middle search: subset sums of each half of the candidates are
+    enumerated (pruned at 1.01 x target), and for every subset of the second
+    half the closest complement from the first half is found by bisection.
+    Combinations are capped at 15 profiles. Differences within
+    target_area * 0.00003 count as exact, in which case fewer profiles win.
 
     Args:
-        candidates: List of (profile, area, distance) tuples from bbox filter
+        candidates: List of (profile, area, centroid_d2) tuples from bbox filter
         target_area: Target circle area
 
     Returns:
         (best_profiles, best_difference) tuple, or (None, inf) if no match.
     """
-    candidates.sort(key=lambda x: x[1], reverse=True)
-
-    best_profiles = None
+    candidates.sort(key=itemgetter(1), reverse=True)
+
+    max_profiles = 15
+    limit = target_area * 1.01
+    exact_tolerance = target_area * 0.00003
+    areas = [item[1] for item in candidates]
+    half = len(areas) // 2
+
+    # First half: group subset sums by size, sorted for bisection
+    sums_by_size = [[] for _ in range(max_profiles + 1)]
+    for subset_sum, indices in _subset_sums(areas[:half], 0, limit, max_profiles):
+        sums_by_size[len(indices)].append((subset_sum, indices))
+    for group in sums_by_size:
+        group.sort()
+    keys_by_size = [[subset_sum for subset_sum, _ in group] for group in sums_by_size]
+
+    best_key = None
+    best_indices = None
     best_difference = float('inf')
-    max_profiles = min(len(candidates), 15)
-
-    for r in range(1, max_profiles + 1):
-        for combo in combinations(candidates, r):
-            combo_area = sum(item[1] for item in combo)
-            difference = abs(combo_area - target_area)
 
-            if difference < best_difference:
-                best_difference = difference
-                best_profiles = [item[0] for item in combo]
-
-            if best_difference <= target_area * 0.00003:
-                break
+    for sum_b, indices_b in _subset_sums(areas[half:], half, limit, max_profiles):
+        remaining = target_area - sum_b
+        for size_a in range(max_profiles - len(indices_b) + 1):
+            group = sums_by_size[size_a]
+            if not group:
+                continue
+            pos = bisect_left(keys_by_size[size_a], remaining)
+            for j in (pos - 1, pos):
+                if j < 0 or j >= len(group):
+                    continue
+                sum_a, indices_a = group[j]
+                count = len(indices_a) + len(indices_b)
+                if count == 0:
+                    continue
+                total = sum_a + sum_b
+                if total > limit:
+                    continue
+                difference = abs(total - target_area)
+                key = (0.0 if difference <= exact_tolerance else difference, count, difference)
+                if best_key is None or key < best_key:
+                    best_key = key
+                    best_indices = indices_a + indices_b
+                    best_difference = difference
 
-        if best_difference <= target_area * 0.00003:
-            break
+    if best_indices is None:
+        return None, float('inf')
 
+    best_profiles = [candidates[i][0] for i in sorted(best_indices)]
     return best_profiles, best_difference
 
 
@@ -211,9 +285,10 @@ def findProfileForCircle(sketch, target_circle):
     Find all profiles that make up the area inside the target circle.
 
     Strategy:
-    1. Coarse filters to reduce candidates (fast, permissive)
+    1. Coarse filters to reduce candidates (fast, permissive, single pass)
        - Area: not larger than circle
        - Centroid: inside circle
+       - Curve points: all sketch entity points inside circle
     2. Precise area-matching to find exact combination (slow, accurate)
 
     Returns:
@@ -226,18 +301,20 @@ def findProfileForCircle(sketch, target_circle):
     circle_radius = target_circle.radius
     target_area = target_circle.area
 
-    candidates_after_area = _filter_by_area(sketch, target_area)
-    if not candidates_after_area:
+    candidates_after_coarse = _filter_coarse(sketch, target_area, circle_center3d, circle_radius)
+    if not candidates_after_coarse:
         return None
 
-    candidates_after_centroid = _filter_by_centroid(candidates_after_area, circle_center3d, circle_radius)
-    if not candidates_after_centroid:
-        return None
-
-    candidates_after_curve = _filter_by_curve_points(candidates_after_centroid, circle_center3d, circle_radius)
+    candidates_after_curve = _filter_by_curve_points(candidates_after_coarse, circle_center3d, circle_radius)
     if not candidates_after_curve:
         return None
 
+    # Fast path: a single profile already covers the circle (the common case)
+    exact_tolerance = target_area * 0.00003
+    for prof, area, _ in candidates_after_curve:
+        if abs(area - target_area) <= exact_tolerance:
+            return prof
+
     best_profiles, best_difference = _accumulate_profiles(candidates_after_curve, target_area)
 
     if best_profiles is None:
@@ -250,10 +327,102 @@ def findProfileForCircle(sketch, target_circle):
     if len(best_profiles) == 1:
         return best_profiles[0]
 
-    coll = adsk.core.ObjectCollection.create()
-    for prof in best_profiles:
-        coll.add(prof)
-    return coll
+    return object_collection(best_profiles)
+
+
+# Sketch frames as plain floats, keyed by sketch entityToken.
+# Cleared at the start of each command execution (clear_sketch_frames()).
+_sketch_frames = {}
+
+
+def clear_sketch_frames():
+    """Forget cached sketch frames (sketch planes may move between executions)."""
+    _sketch_frames.clear()
+
+
+def _get_sketch_frame(sketch):
+    """
+    Return the sketch's coordinate system as float tuples, cached per sketch.
+
+    Returns:
+        (origin, xAxis, yAxis, zAxis), each an (x, y, z) tuple in world space
+    """
+    key = sketch.entityToken
+    frame = _sketch_frames.get(key)
+    if frame is None:
+        origin, xAxis, yAxis, zAxis = sketch.transform.getAsCoordinateSystem()
+        frame = tuple((v.x, v.y, v.z) for v in (origin, xAxis, yAxis, zAxis))
+        _sketch_frames[key] = frame
+    return frame
+
+
+def _sketch_to_world(frame, x, y):
+    """Map a sketch-space point (x, y, 0) to world coordinates using a cached frame."""
+    (ox, oy, oz), (xx, xy, xz), (yx, yy, yz), _ = frame
+    return (ox + x * xx + y * yx, oy + x * xy + y * yy, oz + x * xz + y * yz)
+
+
+def _body_bounds(body):
+    """
+    Return the body's axis-aligned bounding box as plain floats, padded by TOL.
+
+    Returns:
+        (min_x, min_y, min_z, max_x, max_y, max_z) tuple
+    """
+    bbox = body.boundingBox
+    bbMin = bbox.minPoint
+    bbMax = bbox.maxPoint
+    tol = tm_state.TOL
+    return (bbMin.x - tol, bbMin.y - tol, bbMin.z - tol,
+            bbMax.x + tol, bbMax.y + tol, bbMax.z + tol)
+
+
+def _point_containment(body, bounds, x, y, z, scratch=None):
+    """
+    Classify a point against body, skipping the API query for points outside its bounding box.
+
+    Args:
+        body: BRepBody to test against
+        bounds: Padded bounding box tuple from _body_bounds(body)
+        x, y, z: World coordinates of the point (cm)
+        scratch: Optional Point3D reused for the query instead of creating one
+
+    Returns:
+        adsk.fusion.PointContainment enum value
+    """
+    if not (bounds[0] <= x <= bounds[3] and
+            bounds[1] <= y <= bounds[4] and
+            bounds[2] <= z <= bounds[5]):
+        return _OUTSIDE
+    if scratch is None:
+        return body.pointContainment(adsk.core.Point3D.create(x, y, z))
+    scratch.set(x, y, z)
+    return body.pointContainment(scratch)
+
+
+def _direction_from_face(sketch, targetBody, cx, cy, cz, zx, zy, zz):
+    """
+    Derive the cut direction from the sketch's face when it lies on targetBody.
+
+    A BRepFace evaluator returns normals pointing out of the body, so the cut
+    goes against that normal.
+
+    Returns:
+        adsk.fusion.ExtentDirections enum value, or None if the sketch is not
+        on a planar face of targetBody (callers then fall back to probing)
+    """
+    face = sketch.referencePlane
+    if not isinstance(face, adsk.fusion.BRepFace) or face.body != targetBody:
+        return None
+    ok, normal = face.evaluator.getNormalAtPoint(adsk.core.Point3D.create(cx, cy, cz))
+    if not ok:
+        return None
+    dot = normal.x * zx + normal.y * zy + normal.z * zz
+    if dot < -0.5:
+        return _POSITIVE
+    if dot > 0.5:
+        return _NEGATIVE
+    return None
 
 
 def findExtrudeDirectionFromSketch(sketch, circleCenter, targetBody):
@@ -261,76 +430,68 @@ def findExtrudeDirectionFromSketch(sketch, circleCenter, targetBody):
     Determine extrude direction by checking which side of the sketch plane
     enters the target body.
 
+    Sketches on a face of the target body take the side from the face
+    normal and confirm it with a single probe. Otherwise probe points are
+    classified with pointContainment(); probes outside the body's bounding
+    box skip that round-trip.
+
     Returns:
         adsk.fusion.ExtentDirections enum value, or None on failure
     """
     try:
-        sketchTransform = sketch.transform
-        center3DSketch = adsk.core.Point3D.create(circleCenter.x, circleCenter.y, 0)
-        center3D = center3DSketch.copy()
-        center3D.transformBy(sketchTransform)
-
-        (origin, xAxis, yAxis, zAxis) = sketchTransform.getAsCoordinateSystem()
-
-        testDistances = [0.01, 0.05, 0.1, 0.2]
+        frame = _get_sketch_frame(sketch)
+        cx, cy, cz = _sketch_to_world(frame, circleCenter.x, circleCenter.y)
+        zx, zy, zz = frame[3]
+
+        bounds = _body_bounds(targetBody)
+        scratch = adsk.core.Point3D.create(0, 0, 0)
+
+        direction = _direction_from_face(sketch, targetBody, cx, cy, cz, zx, zy, zz)
+        if direction is not None:
+            # The face's plane extends past the face itself (and over existing
+            # holes), so make sure there is material under the point
+            d = 0.01 if direction == _POSITIVE else -0.01
+            containment = _point_containment(
+                targetBody, bounds, cx + zx * d, cy + zy * d, cz + zz * d, scratch)
+            if containment == _INSIDE or containment == _ON:
+                return direction
+
+        # Offsets along the sketch normal, shared by both probe directions
+        testOffsets = [(zx * d, zy * d, zz * d) for d in (0.01, 0.05, 0.1, 0.2)]
 
         positiveIsInside = False
         negativeIsInside = False
 
-        for testDistance in testDistances:
-            positivePoint = adsk.core.Point3D.create(
-                center3D.x + zAxis.x * testDistance,
-                center3D.y + zAxis.y * testDistance,
-                center3D.z + zAxis.z * testDistance
-            )
-            positiveContainment = targetBody.pointContainment(positivePoint)
-            if (positiveContainment == adsk.fusion.PointContainment.PointInsidePointContainment or
-                    positiveContainment == adsk.fusion.PointContainment.PointOnPointContainment):
+        for ox, oy, oz in testOffsets:
+            containment = _point_containment(targetBody, bounds, cx + ox, cy + oy, cz + oz, scratch)
+            if containment == _INSIDE or containment == _ON:
                 positiveIsInside = True
                 break
 
-        for testDistance in testDistances:
-            negativePoint = adsk.core.Point3D.create(
-                center3D.x - zAxis.x * testDistance,
-                center3D.y - zAxis.y * testDistance,
-                center3D.z - zAxis.z * testDistance
-            )
-            negativeContainment = targetBody.pointContainment(negativePoint)
-            if (negativeContainment == adsk.fusion.PointContainment.PointInsidePointContainment or
-                    negativeContainment == adsk.fusion.PointContainment.PointOnPointContainment):
+        for ox, oy, oz in testOffsets:
+            containment = _point_containment(targetBody, bounds, cx - ox, cy - oy, cz - oz, scratch)
+            if containment == _INSIDE or containment == _ON:
                 negativeIsInside = True
                 break
 
         if positiveIsInside and not negativeIsInside:
-            return adsk.fusion.ExtentDirections.PositiveExtentDirection
+            return _POSITIVE
         elif negativeIsInside and not positiveIsInside:
-            return adsk.fusion.ExtentDirections.NegativeExtentDirection
+            return _NEGATIVE
         elif positiveIsInside and negativeIsInside:
-            verySmallDistance = 0.001
+            d = 0.001
 
-            veryClosePositive = adsk.core.Point3D.create(
-                center3D.x + zAxis.x * verySmallDistance,
-                center3D.y + zAxis.y * verySmallDistance,
-                center3D.z + zAxis.z * verySmallDistance
-            )
-            veryCloseNegative = adsk.core.Point3D.create(
-                center3D.x - zAxis.x * verySmallDistance,
-                center3D.y - zAxis.y * verySmallDistance,
-                center3D.z - zAxis.z * verySmallDistance
-            )
-
-            posContain = targetBody.pointContainment(veryClosePositive)
-            negContain = targetBody.pointContainment(veryCloseNegative)
-
-            posOut = (posContain == adsk.fusion.PointContainment.PointOutsidePointContainment)
-            negOut = (negContain == adsk.fusion.PointContainment.PointOutsidePointContainment)
+            posOut = _point_containment(
+                targetBody, bounds, cx + zx * d, cy + zy * d, cz + zz * d, scratch) == _OUTSIDE
+            negOut = _point_containment(
+                targetBody, bounds, cx - zx * d, cy - zy * d, cz - zz * d, scratch) == _OUTSIDE
 
             if posOut and not negOut:
-                return adsk.fusion.ExtentDirections.NegativeExtentDirection
+                return _NEGATIVE
             elif negOut and not posOut:
-                return adsk.fusion.ExtentDirections.PositiveExtentDirection
+                return _POSITIVE
             else:
-                return adsk.fusion.ExtentDirections.PositiveExtentDirection
+                return _POSITIVE
         else:
             return None
 
@@ -340,55 +501,104 @@ def findExtrudeDirectionFromSketch(sketch, circleCenter, targetBody):
         return None
 
 
-def findChamferEdge(extrudeFeature, targetBody, sketch, circleCenter, holeDiameter):
+def _hole_edges(extrudeFeature, targetBody):
+    """
+    Return the edges bounding the cut made by extrudeFeature.
+
+    The hole's entrance and bottom circles are edges of the extrude's side
+    faces, so only those few edges need checking instead of every edge of
+    the body. Falls back to targetBody.edges if the side faces are unavailable.
+    """
+    edges = {}
+    try:
+        for face in extrudeFeature.sideFaces:
+            for edge in face.edges:
+                edges.setdefault(edge.tempId, edge)
+    except Exception:
+        edges = {}
+    if edges:
+        return list(edges.values())
+    return targetBody.edges
+
+
+def snapshot_circular_edges(extrudeFeature, targetBody, expectedRadius=None, radiusTol=0.005):
+    """
+    Read the circle data of every circular edge of a cut once.
+
+    When one extrude cuts many holes, each hole's edge search would otherwise
+    re-read every edge of the shared cut through the API. Take one snapshot
+    per extrude and pass it to findChamferEdge()/findBottomEdge(). Snapshots
+    go stale once a chamfer or fillet changes the body.
+
+    Args:
+        expectedRadius: If given, circles whose radius differs by more than
+            radiusTol are left out, so per-hole lookups scan only hole-sized
+            circles (normal and center are not read for the others)
+
+    Returns:
+        List of EdgeRec(edge, radius, nx, ny, nz, cx, cy, cz) records
+    """
+    snapshot = []
+    for edge in _hole_edges(extrudeFeature, targetBody):
+        edgeCircle = edge.geometry
+        if edgeCircle.curveType != _CIRCLE_3D:
+            continue
+        radius = edgeCircle.radius
+        if expectedRadius is not None and abs(radius - expectedRadius) > radiusTol:
+            continue
+        en = edgeCircle.normal
+        ec = edgeCircle.center
+        snapshot.append(EdgeRec(edge, radius, en.x, en.y, en.z, ec.x, ec.y, ec.z))
+    return snapshot
+
+
+def _snapshot_circles(snapshot, expectedRadius, radiusTol):
+    """Yield (edge, nx, ny, nz, cx, cy, cz) for snapshot entries with the expected radius."""
+    return ((edge, nx, ny, nz, ex, ey, ez)
+            for edge, r, nx, ny, nz, ex, ey, ez in snapshot
+            if abs(r - expectedRadius) <= radiusTol)
+
+
+def findChamferEdge(extrudeFeature, targetBody, sketch, circleCenter, holeDiameter, snapshot=None):
     """
     Find the circular edge at the hole entrance for chamfering.
 
+    Args:
+        snapshot: Optional snapshot_circular_edges() result for extrudeFeature
+            (taken here if omitted)
+
     Returns:
         The edge to chamfer, or None if not found
     """
     try:
-        sketchTransform = sketch.transform
-        center3DSketch = adsk.core.Point3D.create(circleCenter.x, circleCenter.y, 0)
-        center3D = center3DSketch.copy()
-        center3D.transformBy(sketchTransform)
-
-        (origin, xAxis, yAxis, zAxis) = sketchTransform.getAsCoordinateSystem()
+        frame = _get_sketch_frame(sketch)
+        cx, cy, cz = _sketch_to_world(frame, circleCenter.x, circleCenter.y)
+        zx, zy, zz = frame[3]
 
         expectedRadius = holeDiameter / 2.0
-        candidateEdges = []
+        bestEdge = None
+        bestDistance = None
 
-        for edge in targetBody.edges:
-            if edge.geometry.curveType == adsk.core.Curve3DTypes.Circle3DCurveType:
-                edgeCircle = edge.geometry
-                edgeCenter = edgeCircle.center
-                edgeRadius = edgeCircle.radius
-                edgeNormal = edgeCircle.normal
-
-                if abs(edgeRadius - expectedRadius) > 0.001:
-                    continue
+        if snapshot is None:
+            snapshot = snapshot_circular_edges(extrudeFeature, targetBody, expectedRadius, 0.001)
+        circles = _snapshot_circles(snapshot, expectedRadius, 0.001)
 
-                dotProduct = abs(edgeNormal.x * zAxis.x + edgeNormal.y * zAxis.y + edgeNormal.z * zAxis.z)
-                if dotProduct < 0.99:
-                    continue
-
-                vecToEdge = adsk.core.Vector3D.create(
-                    edgeCenter.x - center3D.x,
-                    edgeCenter.y - center3D.y,
-                    edgeCenter.z - center3D.z
-                )
-                projection = vecToEdge.x * zAxis.x + vecToEdge.y * zAxis.y + vecToEdge.z * zAxis.z
-                perpDist = vecToEdge.length - abs(projection)
-                if perpDist > 0.01:
-                    continue
+        for edge, nx, ny, nz, ex, ey, ez in circles:
+            dotProduct = abs(nx * zx + ny * zy + nz * zz)
+            if dotProduct < 0.99:
+                continue
 
-                candidateEdges.append((edge, abs(projection)))
+            vx, vy, vz = ex - cx, ey - cy, ez - cz
+            projection = vx * zx + vy * zy + vz * zz
+            # Squared distance from the hole axis (0.01 cm limit)
+            if (vx * vx + vy * vy + vz * vz) - projection * projection > 0.0001:
+                continue
 
-        if len(candidateEdges) > 0:
-            candidateEdges.sort(key=lambda x: x[1])
-            return candidateEdges[0][0]
+            # Closest to the sketch plane = hole entrance
+            if bestDistance is None or abs(projection) < bestDistance:
+                bestEdge, bestDistance = edge, abs(projection)
 
-        return None
+        return bestEdge
 
     except Exception:
         if tm_state._ui:
@@ -396,64 +606,194 @@ def findChamferEdge(extrudeFeature, targetBody, sketch, circleCenter, holeDiamet
         return None
 
 
-def addChamferToEdge(component, edge, chamferSize):
+def _add_chamfer(component, edges, chamferSize):
     """
-    Add a chamfer to the specified edge.
+    Add one equal-distance chamfer feature covering all given edges.
 
     Returns:
-        The chamfer feature, or None if failed
+        The chamfer feature, or None if Fusion rejects the edge set
     """
     try:
         chamfers = component.features.chamferFeatures
-        edges = adsk.core.ObjectCollection.create()
-        edges.add(edge)
-        chamferInput = chamfers.createInput(edges, True)
+        chamferInput = chamfers.createInput(object_collection(edges), True)
         chamferDistance = adsk.core.ValueInput.createByReal(chamferSize / 10.0)
         chamferInput.setToEqualDistance(chamferDistance)
         chamfer = chamfers.add(chamferInput)
-        return chamfer
-    except Exception:
-        if tm_state._ui:
-            tm_state._ui.messageBox('Error in addChamferToEdge:\n{}'.format(traceback.format_exc()))
+        return chamfer if chamfer else None
+    except Exception as e:
+        log("Chamfer: edge set rejected: %r", e, level=DEBUG)
         return None
 
 
+def addChamferToEdges(component, edgeList, chamferSize):
+    """
+    Add one equal-distance chamfer covering all given edges.
+
+    If Fusion rejects the combined edge set (e.g. where bores overlap), the
+    edges are retried one by one so a single bad edge does not cost every
+    other hole its chamfer.
+
+    Args:
+        component: Component that owns the edges
+        edgeList: List of BRepEdges to chamfer
+        chamferSize: Chamfer size in mm
+
+    Returns:
+        List of created chamfer features
+    """
+    chamfer = _add_chamfer(component, edgeList, chamferSize)
+    if chamfer is not None:
+        return [chamfer]
+    if len(edgeList) < 2:
+        return []
+
+    log("Chamfer: combined chamfer over %d edges rejected, retrying per edge",
+        len(edgeList), level=DEBUG)
+    features = []
+    for edge in edgeList:
+        chamfer = _add_chamfer(component, [edge], chamferSize)
+        if chamfer is not None:
+            features.append(chamfer)
+    if len(features) < len(edgeList):
+        log("Chamfer: rejected for %d of %d edge(s)",
+            len(edgeList) - len(features), len(edgeList), level=DEBUG)
+    return features
+
+
+def _first_exit_from_hits(hitDistances, isInsideAt):
+    """
+    Find where a ray first leaves the body, given its face-hit distances.
+
+    The body boundary is crossed only at face hits, so each span between
+    consecutive hits is either fully inside or fully outside. The first span
+    whose midpoint is inside ends at the first exit.
+
+    Args:
+        hitDistances: Distances (cm) along the ray where it hits body faces
+        isInsideAt: Callable(distance) -> True if that point is inside the body
+
+    Returns:
+        Exit distance in cm, or None if the ray never passes through the body.
+    """
+    previous = 0.0
+    for distance in sorted(hitDistances):
+        if distance - previous > tm_state.TOL:
+            if isInsideAt((previous + distance) / 2.0):
+                return distance
+            previous = distance
+    return None
+
+
+def _ray_extent(bounds, cx, cy, cz, dx, dy, dz):
+    """
+    Return how far a ray from (cx, cy, cz) along unit (dx, dy, dz) can travel
+    before every point beyond is outside the bounding box.
+
+    Args:
+        bounds: Bounding box tuple from _body_bounds()
+
+    Returns:
+        Distance in cm (<= 0 if the box lies entirely behind the ray start)
+    """
+    extent = 0.0
+    for c, d, lo, hi in ((cx, dx, bounds[0], bounds[3]),
+                         (cy, dy, bounds[1], bounds[4]),
+                         (cz, dz, bounds[2], bounds[5])):
+        extent += max(d * (lo - c), d * (hi - c))
+    return extent
+
+
+def _first_exit_by_search(isInsideAt, maxDistance, startDistance=0.1, tolerance=0.01):
+    """
+    Locate the body exit by stepping along the ray, then bisection.
+
+    Until the first inside sample the ray is walked in fixed startDistance
+    steps, so thin walls past a gap are not stepped over. From there the
+    step doubles after every inside sample (capped at maxDistance). Once an
+    outside sample follows an inside one, bisects between them down to
+    tolerance.
+
+    Returns:
+        Exit distance in cm (first outside bound), or None if not found.
+    """
+    lastInside = None
+    distance = min(startDistance, maxDistance)
+    step = startDistance
+    while True:
+        if isInsideAt(distance):
+            if lastInside is not None:
+                step *= 2.0
+            lastInside = distance
+        elif lastInside is not None:
+            low, high = lastInside, distance
+            while high - low > tolerance:
+                mid = (low + high) / 2.0
+                if isInsideAt(mid):
+                    low = mid
+                else:
+                    high = mid
+            return high
+        if distance >= maxDistance:
+            return None
+        distance = min(distance + step, maxDistance)
+
+
 def findDistanceThroughBody(sketch, circleCenter, targetBody, direction):
     """
     Find the distance to cut completely through the body in the given direction.
 
+    Casts one ray from the hole center against the body's faces and takes
+    the first exit; falls back to a stepping/bisection containment search
+    if the ray query yields nothing.
+
     Returns:
         Distance in cm, or fallback of 10.0 cm
     """
     try:
-        sketchTransform = sketch.transform
-        center3DSketch = adsk.core.Point3D.create(circleCenter.x, circleCenter.y, 0)
-        center3D = center3DSketch.copy()
-        center3D.transformBy(sketchTransform)
+        frame = _get_sketch_frame(sketch)
+        cx, cy, cz = _sketch_to_world(frame, circleCenter.x, circleCenter.y)
+        zx, zy, zz = frame[3]
 
-        (origin, xAxis, yAxis, zAxis) = sketchTransform.getAsCoordinateSystem()
+        multiplier = 1.0 if direction == _POSITIVE else -1.0
+        dx, dy, dz = zx * multiplier, zy * multiplier, zz * multiplier
+        bounds = _body_bounds(targetBody)
 
-        multiplier = 1.0 if direction == adsk.fusion.ExtentDirections.PositiveExtentDirection else -1.0
+        scratch = adsk.core.Point3D.create(0, 0, 0)
 
-        maxDistance = 100.0
-        stepSize = 0.1
+        def isInsideAt(distance):
+            return _point_containment(
+                targetBody, bounds,
+                cx + dx * distance, cy + dy * distance, cz + dz * distance, scratch) == _INSIDE
 
-        insideBody = False
         exitDistance = None
 
-        for i in range(1, int(maxDistance / stepSize) + 1):
-            distance = i * stepSize
-            testPoint = adsk.core.Point3D.create(
-                center3D.x + zAxis.x * distance * multiplier,
-                center3D.y + zAxis.y * distance * multiplier,
-                center3D.z + zAxis.z * distance * multiplier
+        try:
+            hitPoints = adsk.core.ObjectCollection.create()
+            hits = targetBody.parentComponent.findBRepUsingRay(
+                adsk.core.Point3D.create(cx, cy, cz),
+                adsk.core.Vector3D.create(dx, dy, dz),
+                _FACE_ENTITY,
+                -1.0,
+                False,
+                hitPoints
             )
-            containment = targetBody.pointContainment(testPoint)
-            if containment == adsk.fusion.PointContainment.PointInsidePointContainment:
-                insideBody = True
-            if insideBody and containment == adsk.fusion.PointContainment.PointOutsidePointContainment:
-                exitDistance = distance
-                break
+            hitDistances = []
+            for i in range(hits.count):
+                if hits.item(i).body != targetBody:
+                    continue
+                hit = hitPoints.item(i)
+                along = (hit.x - cx) * dx + (hit.y - cy) * dy + (hit.z - cz) * dz
+                if along > tm_state.TOL:
+                    hitDistances.append(along)
+            exitDistance = _first_exit_from_hits(hitDistances, isInsideAt)
+        except Exception:
+            exitDistance = None
+
+        if exitDistance is None:
+            # No point past the body's bounding box can be inside it
+            searchLimit = min(100.0, _ray_extent(bounds, cx, cy, cz, dx, dy, dz))
+            if searchLimit > 0:
+                exitDistance = _first_exit_by_search(isInsideAt, searchLimit)
 
         if exitDistance is not None:
             return exitDistance + 0.2
@@ -466,84 +806,148 @@ def findDistanceThroughBody(sketch, circleCenter, targetBody, direction):
         return 10.0
 
 
-def addBottomRadiusToBlindHole(component, extrudeFeature, targetBody, sketch, circleCenter, holeDiameter, radiusSize):
+def findBottomEdge(extrudeFeature, targetBody, sketch, circleCenter, holeDiameter, snapshot=None):
     """
-    Add a fillet to the bottom edge of a blind hole.
+    Find the circular edge at the bottom of a blind hole.
+
+    Args:
+        snapshot: Optional snapshot_circular_edges() result for extrudeFeature
+            (taken here if omitted)
 
     Returns:
-        The fillet feature, or None if failed
+        The bottom edge, or None if not found
     """
     try:
-        sketchTransform = sketch.transform
-        center3DSketch = adsk.core.Point3D.create(circleCenter.x, circleCenter.y, 0)
-        center3D = center3DSketch.copy()
-        center3D.transformBy(sketchTransform)
-
-        (origin, xAxis, yAxis, zAxis) = sketchTransform.getAsCoordinateSystem()
+        frame = _get_sketch_frame(sketch)
+        cx, cy, cz = _sketch_to_world(frame, circleCenter.x, circleCenter.y)
+        zx, zy, zz = frame[3]
 
         expectedRadius = holeDiameter / 2.0
-        filletRadiusCm = radiusSize / 10.0
 
-        candidateEdges = []
+        bottomEdge = None
+        bottomDistance = None
+        candidates = 0
 
-        for edge in targetBody.edges:
-            if edge.geometry.curveType != adsk.core.Curve3DTypes.Circle3DCurveType:
-                continue
-
-            edgeCircle = edge.geometry
-            edgeCenter = edgeCircle.center
-            edgeRadius = edgeCircle.radius
-            edgeNormal = edgeCircle.normal
+        if snapshot is None:
+            snapshot = snapshot_circular_edges(extrudeFeature, targetBody, expectedRadius, 0.005)
+        circles = _snapshot_circles(snapshot, expectedRadius, 0.005)
 
-            if abs(edgeRadius - expectedRadius) > 0.005:
+        for edge, nx, ny, nz, ex, ey, ez in circles:
+            candidates += 1
+            dotProduct = abs(nx * zx + ny * zy + nz * zz)
+            if dotProduct < 0.95:
                 continue
 
-            dotProduct = abs(edgeNormal.x * zAxis.x + edgeNormal.y * zAxis.y + edgeNormal.z * zAxis.z)
-            if dotProduct < 0.95:
+            vx, vy, vz = ex - cx, ey - cy, ez - cz
+            distanceAlongNormal = abs(vx * zx + vy * zy + vz * zz)
+            # Squared distance from the hole axis (0.05 cm limit)
+            if (vx * vx + vy * vy + vz * vz) - distanceAlongNormal * distanceAlongNormal > 0.0025:
                 continue
 
-            vecToEdge = adsk.core.Vector3D.create(
-                edgeCenter.x - center3D.x,
-                edgeCenter.y - center3D.y,
-                edgeCenter.z - center3D.z
-            )
-            distanceAlongNormal = abs(vecToEdge.x * zAxis.x + vecToEdge.y * zAxis.y + vecToEdge.z * zAxis.z)
-            perpDistanceSquared = (vecToEdge.length ** 2) - (distanceAlongNormal ** 2)
-            perpDistance = math.sqrt(max(0, perpDistanceSquared))
+            # Furthest from the sketch plane = bottom of blind hole
+            if bottomDistance is None or distanceAlongNormal > bottomDistance:
+                bottomEdge, bottomDistance = edge, distanceAlongNormal
 
-            if perpDistance > 0.05:
-                continue
-            candidateEdges.append((edge, distanceAlongNormal))
+        if bottomEdge is None:
+            # Diagnostics only on the failure path, formatted only at DEBUG level
+            log("Bottom radius: no on-axis edge among %d circular edge(s) of radius %.2f mm",
+                candidates, expectedRadius * 10, level=DEBUG)
 
-        if len(candidateEdges) == 0:
-            return None
+        return bottomEdge
 
-        # Sort by distance: furthest = bottom of blind hole
-        candidateEdges.sort(key=lambda x: x[1], reverse=True)
-        bottomEdge = candidateEdges[0][0]
+    except Exception:
+        if tm_state._ui:
+            tm_state._ui.messageBox('Error in findBottomEdge:\n{}'.format(traceback.format_exc()))
+        return None
 
-        fillets = component.features.filletFeatures
-        edgeCollection = adsk.core.ObjectCollection.create()
-        edgeCollection.add(bottomEdge)
 
-        filletInput = fillets.createInput()
+def _add_fillet(component, edges, radiusCm):
+    """
+    Add one constant-radius fillet feature covering all given edges.
 
-        try:
-            filletInput.addConstantRadiusEdgeSet(
-                edgeCollection,
-                adsk.core.ValueInput.createByReal(filletRadiusCm),
-                True
-            )
-        except Exception:
-            return None
+    Returns:
+        The fillet feature, or None if Fusion rejects the edge set
+    """
+    fillets = component.features.filletFeatures
+    edgeCollection = object_collection(edges)
 
-        try:
-            fillet = fillets.add(filletInput)
-            return fillet if fillet else None
-        except Exception:
-            return None
+    filletInput = fillets.createInput()
 
-    except Exception:
-        if tm_state._ui:
-            tm_state._ui.messageBox('Error in addBottomRadiusToBlindHole:\n{}'.format(traceback.format_exc()))
+    try:
+        filletInput.addConstantRadiusEdgeSet(
+            edgeCollection,
+            adsk.core.ValueInput.createByReal(radiusCm),
+            True
+        )
+    except Exception as e:
+        # Expected for unsuitable edges; keep it cheap (no traceback formatting)
+        log("Bottom radius: edge set rejected: %r", e, level=DEBUG)
+        return None
+
+    try:
+        fillet = fillets.add(filletInput)
+        return fillet if fillet else None
+    except Exception as e:
+        log("Bottom radius: fillet feature failed: %r", e, level=DEBUG)
         return None
+
+
+def _fillet_fits(edgeRadius, radiusCm):
+    """
+    Cheap pre-flight check before asking Fusion for a bottom fillet.
+
+    A fillet on the bottom circle of a hole cannot be wider than the hole,
+    so radii above 95% of the edge's circle radius would only fail inside
+    fillets.add(). edgeRadius comes from the edge snapshot, so no API call
+    is made here.
+    """
+    if radiusCm > edgeRadius * 0.95:
+        log("Bottom radius: %.2f mm fillet too large for %.2f mm hole radius, skipped",
+            radiusCm * 10, edgeRadius * 10, level=DEBUG)
+        return False
+    return True
+
+
+def flushPendingFillets(component, pending):
+    """
+    Create queued bottom fillets with one fillet feature per radius.
+
+    If Fusion rejects a combined edge set, its edges are retried one by one
+    so a single bad edge does not cost every other hole its fillet.
+
+    Edges too small for the requested radius are dropped up front (see
+    _fillet_fits()).
+
+    Args:
+        component: Component that owns the edges
+        pending: Dict {radius_cm: [(edge, edge_radius_cm)]}, edge radii taken
+            from the snapshot the edges were found in; emptied on return
+
+    Returns:
+        List of created fillet features
+    """
+    features = []
+    for radiusCm, edges in pending.items():
+        edges = [edge for edge, edgeRadius in edges if _fillet_fits(edgeRadius, radiusCm)]
+        if not edges:
+            continue
+        fillet = _add_fillet(component, edges, radiusCm)
+        if fillet is not None:
+            features.append(fillet)
+        elif len(edges) > 1:
+            log("Bottom radius: combined %.2f mm fillet over %d edges rejected, retrying per edge",
+                radiusCm * 10, len(edges), level=DEBUG)
+            rejected = 0
+            for edge in edges:
+                fillet = _add_fillet(component, [edge], radiusCm)
+                if fillet is not None:
+                    features.append(fillet)
+                else:
+                    rejected += 1
+            if rejected:
+                log("Bottom radius: %.2f mm fillet rejected for %d of %d edge(s)",
+                    radiusCm * 10, rejected, len(edges), level=DEBUG)
+        else:
+            log("Bottom radius: %.2f mm fillet rejected for one edge", radiusCm * 10, level=DEBUG)
+    pending.clear()
+    return features
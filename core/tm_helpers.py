@@ -27,6 +27,38 @@ def isSameCircle(c1, c2, tol=None):
     return abs(c1.radius - c2.radius) < tol
 
 
+def point_key(p, tol=None):
+    """
+    Return a hashable grid key for a Point3D, for set/dict based de-duplication.
+
+    Points closer than tol usually share a key; two points straddling a grid
+    line can still map to neighbouring keys, so this is not a drop-in
+    replacement for isSamePoint() where exact tolerance matters.
+    """
+    if tol is None:
+        tol = tm_state.TOL
+    inv = 1.0 / tol
+    return (round(p.x * inv), round(p.y * inv), round(p.z * inv))
+
+
+def object_collection(items):
+    """
+    Build an ObjectCollection from a Python iterable.
+
+    Uses ObjectCollection.createWithArray() (one API call) and falls back to
+    create() + add() on Fusion versions without it.
+    """
+    items = list(items)
+    try:
+        return adsk.core.ObjectCollection.createWithArray(items)
+    except AttributeError:
+        coll = adsk.core.ObjectCollection.create()
+        add = coll.add
+        for item in items:
+            add(item)
+        return coll
+
+
 def calc_blind_hole_depth(insert_len_mm, extra_depth_mm):
     """
     Calculate the extrusion depth for a blind hole in cm (Fusion's internal unit).
@@ -41,14 +73,57 @@ def calc_blind_hole_depth(insert_len_mm, extra_depth_mm):
     return (insert_len_mm + extra_depth_mm) / 10.0
 
 
-def log(msg):
-    """Write a message to Fusion's Text Commands palette (only if logging enabled)."""
+# Mirrors CONFIG['enable_logging']; refreshed by tm_config.load_config()
+_LOG_ENABLED = False
+
+# Log levels: messages above LOG_LEVEL are dropped before formatting.
+# Set log_level = debug in config.ini for per-hole geometry diagnostics.
+INFO = 1
+DEBUG = 2
+LOG_LEVELS = {'info': INFO, 'debug': DEBUG}
+LOG_LEVEL = INFO
+
+# TextCommands palette, looked up on first use by _text_palette()
+_palette = None
+
+
+def set_log_enabled(enabled):
+    """Enable or disable log() output (called after config.ini is loaded)."""
+    global _LOG_ENABLED
+    _LOG_ENABLED = bool(enabled)
+
+
+def set_log_level(name):
+    """Set LOG_LEVEL from a config.ini level name ('info' or 'debug'); unknown names mean INFO."""
+    global LOG_LEVEL
+    LOG_LEVEL = LOG_LEVELS.get(str(name).strip().lower(), INFO)
+
+
+def _text_palette():
+    """Return the TextCommands palette, caching the lookup across log() calls."""
+    global _palette
+    if _palette is None or not _palette.isValid:
+        _palette = adsk.core.Application.get().userInterface.palettes.itemById('TextCommands')
+    return _palette
+
+
+def log(msg, *args, level=INFO):
+    """
+    Write a message to Fusion's Text Commands palette (only if logging enabled).
+
+    msg may be a string or a zero-argument callable returning one, e.g.
+    log(lambda: f"area={area:.4f}"); a string msg with args is %-formatted,
+    e.g. log("area=%.4f", area). Either way nothing is formatted when logging
+    is disabled or level is above LOG_LEVEL.
+    """
+    if not _LOG_ENABLED or level > LOG_LEVEL:
+        return
     try:
-        if not tm_state.CONFIG.get('enable_logging', False):
-            return
-        app = adsk.core.Application.get()
-        ui = app.userInterface
-        p = ui.palettes.itemById('TextCommands')
+        if callable(msg):
+            msg = msg()
+        elif args:
+            msg = msg % args
+        p = _text_palette()
         if not p.isVisible:
             p.isVisible = True
         p.writeText(str(msg))
@@ -57,17 +132,14 @@ def log(msg):
 
 
 def clear_log():
-    """Clear the Text Commands palette (workaround: write 50 blank lines)."""
+    """Clear the Text Commands palette by scrolling it with one block of blank lines."""
+    if not _LOG_ENABLED:
+        return
     try:
-        app = adsk.core.Application.get()
-        ui = app.userInterface
-        p = ui.palettes.itemById('TextCommands')
+        p = _text_palette()
         if p:
-            for _ in range(50):
-                p.writeText('')
+            p.writeText('\n' * 49)
             if not p.isVisible:
                 p.isVisible = True
     except Exception:
         pass
-
-
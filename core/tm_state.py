@@ -36,6 +36,7 @@ CONFIG = {
     'bottom_radius_enabled_default': False,
     'show_success_message': True,
     'enable_logging': False,
+    'log_level': 'info',
     'enable_debug_export': False,
     'hole_type_blind': True,
     'last_selected_insert': 'M3 x 5.7mm (standard)',
@@ -44,9 +45,18 @@ CONFIG = {
 # Event handler references (kept in scope to prevent garbage collection)
 _handlers = []
 
-# Fusion 360 application and UI handles
-_app = adsk.core.Application.get()
-_ui = _app.userInterface
+# Fusion 360 application and UI handles (_app, _ui) are resolved lazily
+# on first access via the module-level __getattr__ below.
+
+
+def __getattr__(name):
+    """Resolve _app/_ui on first use instead of at add-in import time."""
+    if name in ('_app', '_ui'):
+        global _app, _ui
+        _app = adsk.core.Application.get()
+        _ui = _app.userInterface
+        return globals()[name]
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
 
 # Command identity
 CMD_ID = 'ThreadMeisterCmd'
@@ -4,10 +4,9 @@ tm_ui.py – UI event handlers and dialog helper.
 Handles CommandCreated, InputChanged, ValidateInputs events and
 the updateInfoText helper that refreshes the info text box.
 """
-import adsk.core, adsk.fusion, traceback
+import adsk.core, traceback
 import tm_state
 import tm_config
-from tm_execute import CommandExecuteHandler
 
 
 class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
@@ -18,6 +17,8 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
 
             cmd = args.command
 
+            # Deferred: pulls in the geometry module only when the command is used
+            from tm_execute import CommandExecuteHandler
             onExecute = CommandExecuteHandler()
             cmd.execute.add(onExecute)
             tm_state._handlers.append(onExecute)
@@ -50,12 +51,9 @@ class CommandCreatedHandler(adsk.core.CommandCreatedEventHandler):
             insertList = insertDropdown.listItems
 
             lastSelected = tm_state.CONFIG.get('last_selected_insert', 'M3 x 5.7mm (standard)')
-            foundLastSelected = False
-            for name in tm_state.INSERT_SPECS.keys():
-                isSelected = (name == lastSelected)
-                if isSelected:
-                    foundLastSelected = True
-                insertList.add(name, isSelected)
+            foundLastSelected = lastSelected in tm_state.INSERT_SPECS
+            for name in tm_state.INSERT_SPECS:
+                insertList.add(name, name == lastSelected)
 
             if not foundLastSelected and insertList.count > 0:
                 insertList.item(0).isSelected = True
@@ -2,11 +2,12 @@
 Pytest configuration and shared fixtures.
 
 CRITICAL: Must mock adsk module BEFORE any project imports,
-since tm_state calls adsk.core.Application.get() at module import time.
+since the tm_* modules import adsk at module import time.
 """
 
 import sys
 import os
+import pytest
 from unittest.mock import MagicMock
 
 # Stub adsk module before any project imports
@@ -28,7 +29,15 @@ def create_object_collection():
 
     return coll
 
+def create_object_collection_with_array(items):
+    """Create a mock ObjectCollection pre-filled with items."""
+    coll = create_object_collection()
+    for item in items:
+        coll.add(item)
+    return coll
+
 adsk_mock.core.ObjectCollection.create = create_object_collection
+adsk_mock.core.ObjectCollection.createWithArray = create_object_collection_with_array
 
 sys.modules['adsk'] = adsk_mock
 sys.modules['adsk.core'] = adsk_mock.core
@@ -48,8 +57,18 @@ tm_state.CONFIG['enable_logging'] = False
 # Override log function to print to stdout during tests (optional for debugging)
 import tm_helpers
 _original_log = tm_helpers.log
-def debug_log(msg):
+def debug_log(msg, *args, level=None):
     """Log to stdout for debugging tests."""
     if tm_state.CONFIG.get('enable_logging', False):
+        if callable(msg):
+            msg = msg()
+        elif args:
+            msg = msg % args
         print(msg)
 tm_helpers.log = debug_log
+
+
+@pytest.fixture
+def real_log():
+    """The unpatched tm_helpers.log, for tests of the logging itself."""
+    return _original_log
@@ -10,9 +10,26 @@ from tm_config import (
     load_config,
     save_last_selected_insert,
     save_checkbox_states,
-    create_default_config
+    create_default_config,
+    _write_settings,
+    _parse_ini,
+    _get_bool,
+    _read_float
 )
+import tm_config
 import tm_state
+import tm_helpers
+
+
+@pytest.fixture
+def isolated_config(tmp_path, monkeypatch):
+    """Point tm_config at a temp config.ini and isolate the shared state it mutates."""
+    config_file = tmp_path / "config.ini"
+    monkeypatch.setattr(tm_config, '_CONFIG_FILE', str(config_file))
+    monkeypatch.setattr(tm_config, '_config_cache', {'mtime': None, 'specs': None, 'cfg': None})
+    monkeypatch.setattr(tm_state, 'CONFIG', dict(tm_state.CONFIG))
+    monkeypatch.setattr(tm_state, 'INSERT_SPECS', dict(tm_state.INSERT_SPECS))
+    return config_file
 
 
 class TestGetDefaultInserts:
@@ -55,6 +72,12 @@ class TestGetDefaultInserts:
         assert insert_len == 12.7
         assert min_wall == 3.0
 
+    def test_returns_independent_copy(self):
+        """Mutating the returned dict should not affect later calls."""
+        inserts = get_default_inserts()
+        inserts.clear()
+        assert len(get_default_inserts()) == 13
+
     def test_all_values_positive(self):
         """All values should be positive."""
         inserts = get_default_inserts()
@@ -96,6 +119,87 @@ class TestLoadConfig:
         inserts = get_default_inserts()
         assert len(inserts) == 13
 
+    def test_load_reads_temp_config(self, isolated_config):
+        """load_config reads settings and inserts from the config file."""
+        isolated_config.write_text(
+            '[Settings]\n'
+            'chamfer_size = 0.8\n'
+            'hole_type_blind = False\n'
+            '\n'
+            '[Inserts]\n'
+            'M3 x 5.7mm (standard) = 4.4, 5.7, 1.6\n',
+            encoding='utf-8'
+        )
+
+        inserts, config = load_config()
+
+        assert config['chamfer_size'] == 0.8
+        assert config['hole_type_blind'] is False
+        assert inserts == {'M3 x 5.7mm (standard)': (4.4, 5.7, 1.6)}
+
+    def test_log_level_applied_to_log(self, isolated_config, monkeypatch):
+        """log_level = debug raises tm_helpers.LOG_LEVEL to DEBUG."""
+        monkeypatch.setattr(tm_helpers, 'LOG_LEVEL', tm_helpers.INFO)
+        monkeypatch.setitem(tm_state.CONFIG, 'log_level', 'info')
+        isolated_config.write_text(
+            '[Settings]\nlog_level = Debug\n\n[Inserts]\nM2 x 3mm = 3.2, 3.0, 1.5\n', encoding='utf-8')
+
+        _, config = load_config()
+
+        assert config['log_level'] == 'debug'
+        assert tm_helpers.LOG_LEVEL == tm_helpers.DEBUG
+
+    def test_unchanged_file_is_not_reparsed(self, isolated_config, monkeypatch):
+        """A second load with the same mtime reuses the cached parse."""
+        isolated_config.write_text(
+            '[Inserts]\nM2 x 3mm = 3.2, 3.0, 1.5\n', encoding='utf-8')
+        load_config()
+
+        def fail_parse(config_file):
+            raise AssertionError('config.ini should not be parsed again')
+
+        monkeypatch.setattr(tm_config, '_parse_ini', fail_parse)
+        tm_state.INSERT_SPECS.clear()
+
+        inserts, _ = load_config()
+
+        assert inserts == {'M2 x 3mm': (3.2, 3.0, 1.5)}
+
+    def test_saved_settings_keep_cache_valid(self, isolated_config, monkeypatch):
+        """Saving dialog state updates the cache instead of forcing a reparse."""
+        isolated_config.write_text(
+            '[Settings]\nchamfer_enabled_default = True\n\n'
+            '[Inserts]\nM2 x 3mm = 3.2, 3.0, 1.5\n', encoding='utf-8')
+        load_config()
+        save_checkbox_states(False, True, False, True)
+        save_last_selected_insert('M2 x 3mm')
+
+        def fail_parse(config_file):
+            raise AssertionError('config.ini should not be parsed again')
+
+        monkeypatch.setattr(tm_config, '_parse_ini', fail_parse)
+
+        _, config = load_config()
+
+        assert config['chamfer_enabled_default'] is False
+        assert config['bottom_radius_enabled_default'] is True
+        assert config['last_selected_insert'] == 'M2 x 3mm'
+
+    def test_modified_file_is_reparsed(self, isolated_config):
+        """A changed mtime invalidates the cached parse."""
+        isolated_config.write_text(
+            '[Inserts]\nM2 x 3mm = 3.2, 3.0, 1.5\n', encoding='utf-8')
+        load_config()
+
+        isolated_config.write_text(
+            '[Inserts]\nM4 x 4mm (short) = 5.6, 4.0, 2.0\n', encoding='utf-8')
+        stat = os.stat(isolated_config)
+        os.utime(isolated_config, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        inserts, _ = load_config()
+
+        assert inserts == {'M4 x 4mm (short)': (5.6, 4.0, 2.0)}
+
     def test_invalid_chamfer_size_resets(self, tmp_path):
         """Out-of-range chamfer_size should reset to default."""
         # Create config with invalid chamfer_size (10.0 > 5.0 max)
@@ -138,6 +242,41 @@ class TestLoadConfig:
         assert extra_depth == 1.0
 
 
+class TestReadFloat:
+    """Test _read_float range validation shared by the numeric settings."""
+
+    def test_value_in_range(self):
+        """In-range values are returned without warnings."""
+        warnings = []
+        value = _read_float({'chamfer_size': '0.8'}, 'chamfer_size', 0.5, 0.0, 5.0,
+                            'Chamfer size', warnings, lo_inclusive=False)
+        assert value == 0.8
+        assert warnings == []
+
+    def test_out_of_range_uses_default(self):
+        """Out-of-range values fall back to the default with a warning."""
+        warnings = []
+        value = _read_float({'chamfer_size': '10.0'}, 'chamfer_size', 0.5, 0.0, 5.0,
+                            'Chamfer size', warnings, lo_inclusive=False)
+        assert value == 0.5
+        assert warnings == ['Chamfer size 10.0mm is unusual (expected 0-5mm). Using default 0.5mm.']
+
+    def test_exclusive_lower_bound(self):
+        """lo_inclusive=False rejects a value equal to the lower bound."""
+        warnings = []
+        assert _read_float({'x': '0'}, 'x', 0.5, 0.0, 5.0, 'X', warnings, lo_inclusive=False) == 0.5
+        assert _read_float({'x': '0'}, 'x', 1.0, 0.0, 10.0, 'X', warnings) == 0.0
+        assert len(warnings) == 1
+
+    def test_malformed_uses_default(self):
+        """Non-numeric values fall back to the default with a warning."""
+        warnings = []
+        value = _read_float({'blind_hole_extra_depth': 'deep'}, 'blind_hole_extra_depth', 1.0,
+                            0.0, 10.0, 'Extra depth', warnings)
+        assert value == 1.0
+        assert warnings == ['Invalid blind_hole_extra_depth value. Using default 1.0mm.']
+
+
 class TestSaveLastSelectedInsert:
     """Test save_last_selected_insert function."""
 
@@ -192,6 +331,140 @@ class TestSaveCheckboxStates:
         assert blind_hole is False
 
 
+class TestParseIni:
+    """Test _parse_ini regex-based config reader."""
+
+    def test_matches_configparser(self, tmp_path):
+        """Sections and keys match what RawConfigParser reads."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text(
+            '[Settings]\n'
+            '# Default chamfer size in mm\n'
+            'chamfer_size = 0.5\n'
+            'last_selected_insert = M3 x 5.7mm (standard)\n'
+            '\n'
+            '[Inserts]\n'
+            'M3 x 5.7mm (standard) = 4.4, 5.7, 1.6\n'
+            '1/4"-20 x 12.7mm (camera) = 8.0, 12.7, 3.0\n'
+            '# My Custom M3 = 4.5, 6.0, 1.6\n',
+            encoding='utf-8'
+        )
+
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str
+        parser.read(str(config_file), encoding='utf-8')
+        expected = {section: dict(parser.items(section)) for section in parser.sections()}
+
+        assert _parse_ini(str(config_file)) == expected
+
+    def test_leading_bom_is_ignored(self, tmp_path):
+        """A BOM before the first section header does not hide the section."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text('[Settings]\nchamfer_size = 0.8\n', encoding='utf-8-sig')
+        assert _parse_ini(str(config_file)) == {'Settings': {'chamfer_size': '0.8'}}
+
+    def test_write_settings_keeps_bom_file_readable(self, tmp_path):
+        """Rewriting a BOM-prefixed file keeps its [Settings] section intact."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text('[Settings]\nchamfer_size = 0.5\n', encoding='utf-8-sig')
+        _write_settings(str(config_file), {'chamfer_size': 0.8})
+        assert _parse_ini(str(config_file)) == {'Settings': {'chamfer_size': '0.8'}}
+
+    def test_get_bool_accepts_configparser_spellings(self):
+        """Boolean values use the same spellings as configparser."""
+        section = {'a': 'True', 'b': 'off', 'c': '1', 'd': 'maybe'}
+        assert _get_bool(section, 'a', False) is True
+        assert _get_bool(section, 'b', True) is False
+        assert _get_bool(section, 'c', False) is True
+        assert _get_bool(section, 'missing', True) is True
+        with pytest.raises(ValueError):
+            _get_bool(section, 'd', True)
+
+
+class TestWriteSettings:
+    """Test _write_settings targeted line rewrite."""
+
+    def test_replaces_existing_keys_in_place(self, tmp_path):
+        """Existing keys are rewritten; comments and inserts are preserved."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text(
+            '[Settings]\n'
+            '# Default chamfer size in mm\n'
+            'chamfer_size = 0.5\n'
+            'hole_type_blind = True\n'
+            '\n'
+            '[Inserts]\n'
+            'M3 x 5.7mm (standard) = 4.4, 5.7, 1.6\n',
+            encoding='utf-8'
+        )
+
+        _write_settings(str(config_file), {'hole_type_blind': False})
+
+        text = config_file.read_text(encoding='utf-8')
+        assert '# Default chamfer size in mm' in text
+        assert 'hole_type_blind = False' in text
+        assert 'hole_type_blind = True' not in text
+
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str
+        parser.read(str(config_file))
+        assert parser.get('Settings', 'chamfer_size') == '0.5'
+        assert parser.get('Inserts', 'M3 x 5.7mm (standard)') == '4.4, 5.7, 1.6'
+
+    def test_appends_missing_keys_to_settings(self, tmp_path):
+        """Missing keys are added to [Settings], not to a later section."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text(
+            '[Settings]\n'
+            'chamfer_size = 0.5\n'
+            '\n'
+            '[Inserts]\n'
+            'M2 x 3mm = 3.2, 3.0, 1.5\n',
+            encoding='utf-8'
+        )
+
+        _write_settings(str(config_file), {
+            'chamfer_enabled_default': True,
+            'last_selected_insert': 'M2 x 3mm',
+        })
+
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str
+        parser.read(str(config_file))
+        assert parser.get('Settings', 'chamfer_enabled_default') == 'True'
+        assert parser.get('Settings', 'last_selected_insert') == 'M2 x 3mm'
+        assert parser.options('Inserts') == ['M2 x 3mm']
+
+    def test_failed_replace_removes_temp_file(self, tmp_path, monkeypatch):
+        """A failing replace re-raises and leaves no config.ini.tmp behind."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text('[Settings]\nchamfer_size = 0.5\n', encoding='utf-8')
+
+        def fail_replace(src, dst):
+            raise OSError('locked')
+
+        monkeypatch.setattr(tm_config.os, 'replace', fail_replace)
+
+        with pytest.raises(OSError):
+            _write_settings(str(config_file), {'chamfer_size': 0.8})
+
+        assert not (tmp_path / "config.ini.tmp").exists()
+        assert config_file.read_text(encoding='utf-8') == '[Settings]\nchamfer_size = 0.5\n'
+
+    def test_creates_settings_section_if_missing(self, tmp_path):
+        """A [Settings] section is created when the file has none."""
+        config_file = tmp_path / "config.ini"
+        config_file.write_text('[Inserts]\nM2 x 3mm = 3.2, 3.0, 1.5\n', encoding='utf-8')
+
+        _write_settings(str(config_file), {'show_success_message': False})
+
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str
+        parser.read(str(config_file))
+        assert parser.get('Settings', 'show_success_message') == 'False'
+        assert parser.has_option('Inserts', 'M2 x 3mm')
+
+
 class TestCreateDefaultConfig:
     """Test create_default_config function."""
 
@@ -224,3 +497,19 @@ class TestCreateDefaultConfig:
         assert parser.has_section('Inserts')
         assert parser.get('Settings', 'chamfer_size') == '0.5'
         assert len(parser.items('Inserts')) == 13
+
+    def test_create_default_config_writes_file(self, isolated_config):
+        """create_default_config writes a file load_config accepts as-is."""
+        create_default_config()
+
+        parser = configparser.RawConfigParser()
+        parser.optionxform = str
+        parser.read(str(isolated_config), encoding='utf-8')
+        assert parser.get('Settings', 'last_selected_insert') == 'M3 x 5.7mm (standard)'
+        assert dict(parser.items('Inserts')) == {
+            name: f'{dia}, {length}, {wall}'
+            for name, (dia, length, wall) in get_default_inserts().items()
+        }
+
+        inserts, _ = load_config()
+        assert inserts == get_default_inserts()
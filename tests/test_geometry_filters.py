@@ -7,11 +7,25 @@ import math
 from types import SimpleNamespace
 from unittest.mock import MagicMock
 from tm_geometry import (
-    _filter_by_area,
-    _filter_by_centroid,
+    _filter_coarse,
     _filter_by_bounding_box,
-    _accumulate_profiles
+    _accumulate_profiles,
+    _body_bounds,
+    _point_containment,
+    _hole_edges,
+    _direction_from_face,
+    _ray_extent,
+    flushPendingFillets,
+    addChamferToEdges,
+    snapshot_circular_edges,
+    findChamferEdge,
+    findBottomEdge,
+    _get_sketch_frame,
+    _sketch_to_world,
+    _first_exit_from_hits,
+    _first_exit_by_search
 )
+import tm_geometry
 
 
 # Helper functions to create mock objects
@@ -58,138 +72,44 @@ def make_profile(area, centroid_x=0.0, centroid_y=0.0, centroid_z=0.0,
     return profile
 
 
-class TestFilterByArea:
-    """Test _filter_by_area function."""
-
-    def test_profile_with_exact_target_area(self):
-        """Profile with exact target area should be included."""
-        target_area = 10.0
-        profile = make_profile(area=10.0)
-
-        # Create a mock sketch
-        sketch = MagicMock()
-        sketch.profiles = [profile]
-
-        result = _filter_by_area(sketch, target_area)
-
-        assert len(result) == 1
-        assert result[0][0] == profile
-        assert result[0][1] == 10.0
-
-    def test_profile_within_1_percent_threshold(self):
-        """Profile with area within 1% of target should be included."""
-        target_area = 10.0
-        profile = make_profile(area=10.09)  # 1.009 * target
-
-        sketch = MagicMock()
-        sketch.profiles = [profile]
-
-        result = _filter_by_area(sketch, target_area)
-
-        assert len(result) == 1
-
-    def test_profile_exceeds_1_percent_threshold(self):
-        """Profile with area >1% above target should be excluded."""
-        target_area = 10.0
-        profile = make_profile(area=10.11)  # > 1.01 * target
+class TestFilterCoarse:
+    """Test _filter_coarse single-pass area + centroid filter."""
 
+    def make_sketch(self, *profiles):
         sketch = MagicMock()
-        sketch.profiles = [profile]
+        sketch.profiles = list(profiles)
+        return sketch
 
-        result = _filter_by_area(sketch, target_area)
-
-        assert len(result) == 0
-
-    def test_multiple_profiles_filtered(self):
-        """Filter multiple profiles by area."""
-        target_area = 10.0
-        # Threshold: target_area * 1.01 = 10.1
-        profile1 = make_profile(area=9.5)       # < 10.1: included
-        profile2 = make_profile(area=10.0)      # <= 10.1: included
-        profile3 = make_profile(area=10.05)     # <= 10.1: included
-        profile4 = make_profile(area=15.0)      # > 10.1: excluded
-
-        sketch = MagicMock()
-        sketch.profiles = [profile1, profile2, profile3, profile4]
-
-        result = _filter_by_area(sketch, target_area)
-
-        # profile1, profile2, profile3 should be included; profile4 excluded
-        assert len(result) == 3
-        assert profile1 in [p for p, _ in result]
-        assert profile2 in [p for p, _ in result]
-        assert profile3 in [p for p, _ in result]
-        assert profile4 not in [p for p, _ in result]
+    def test_area_threshold_is_one_percent(self):
+        """Areas up to 1% above the target pass; larger ones are dropped."""
+        within = make_profile(area=10.09)
+        above = make_profile(area=10.11)
+        result = _filter_coarse(self.make_sketch(within, above), 10.0, make_point(0.0, 0.0, 0.0), 5.0)
+        assert [p for p, _, _ in result] == [within]
 
     def test_empty_profiles(self):
-        """Empty profile list should return empty."""
-        sketch = MagicMock()
-        sketch.profiles = []
-
-        result = _filter_by_area(sketch, 10.0)
-
-        assert len(result) == 0
-
-
-class TestFilterByCentroid:
-    """Test _filter_by_centroid function."""
-
-    def test_centroid_at_circle_center(self):
-        """Centroid at circle center should be included."""
-        circle_center = make_point(0.0, 0.0, 0.0)
-        circle_radius = 5.0
-
-        profile = make_profile(area=10.0, centroid_x=0.0, centroid_y=0.0, centroid_z=0.0)
-        candidates = [(profile, 10.0)]
-
-        result = _filter_by_centroid(candidates, circle_center, circle_radius)
-
-        assert len(result) == 1
-        assert result[0][0] == profile
-
-    def test_centroid_at_circle_edge(self):
-        """Centroid at circle edge (distance == radius) should be included."""
-        circle_center = make_point(0.0, 0.0, 0.0)
-        circle_radius = 5.0
-
-        # Centroid at distance 5.0 from center
-        profile = make_profile(area=10.0, centroid_x=5.0, centroid_y=0.0, centroid_z=0.0)
-        candidates = [(profile, 10.0)]
-
-        result = _filter_by_centroid(candidates, circle_center, circle_radius)
+        """A sketch without profiles gives no candidates."""
+        assert _filter_coarse(self.make_sketch(), 10.0, make_point(0.0, 0.0, 0.0), 5.0) == []
 
-        assert len(result) == 1
-
-    def test_centroid_outside_circle(self):
-        """Centroid outside circle should be excluded."""
+    def test_area_and_centroid_filtered(self):
+        """Profiles must pass both the area and the centroid check."""
         circle_center = make_point(0.0, 0.0, 0.0)
         circle_radius = 5.0
+        profiles = [
+            make_profile(area=5.0, centroid_x=0.0, centroid_y=0.0),   # kept
+            make_profile(area=15.0, centroid_x=0.0, centroid_y=0.0),  # too large
+            make_profile(area=6.0, centroid_x=3.0, centroid_y=4.0),   # on edge: kept
+            make_profile(area=7.0, centroid_x=4.0, centroid_y=4.0),   # outside
+        ]
+        sketch = MagicMock()
+        sketch.profiles = profiles
 
-        # Centroid at distance 6.0 from center
-        profile = make_profile(area=10.0, centroid_x=6.0, centroid_y=0.0, centroid_z=0.0)
-        candidates = [(profile, 10.0)]
-
-        result = _filter_by_centroid(candidates, circle_center, circle_radius)
-
-        assert len(result) == 0
-
-    def test_multiple_candidates_filtered(self):
-        """Filter multiple candidates by centroid."""
-        circle_center = make_point(0.0, 0.0, 0.0)
-        circle_radius = 5.0
-
-        profile1 = make_profile(area=5.0, centroid_x=0.0, centroid_y=0.0)
-        profile2 = make_profile(area=6.0, centroid_x=3.0, centroid_y=4.0)  # distance 5.0
-        profile3 = make_profile(area=7.0, centroid_x=4.0, centroid_y=4.0)  # distance ~5.66 > 5.0
-
-        candidates = [(profile1, 5.0), (profile2, 6.0), (profile3, 7.0)]
-
-        result = _filter_by_centroid(candidates, circle_center, circle_radius)
+        result = _filter_coarse(sketch, 10.0, circle_center, circle_radius)
 
-        assert len(result) == 2
-        assert profile1 in [p for p, _, _ in result]
-        assert profile2 in [p for p, _, _ in result]
-        assert profile3 not in [p for p, _, _ in result]
+        assert [p for p, _, _ in result] == [profiles[0], profiles[2]]
+        assert result[1][2] == pytest.approx(25.0)
+        for profile in profiles:
+            assert profile.areaProperties.call_count == 1
 
 
 class TestFilterByBoundingBox:
@@ -366,3 +286,491 @@ class TestAccumulateProfiles:
         assert len(profiles) == 2
         assert profile2 in profiles
         assert profile3 in profiles
+
+    def test_many_candidates_finds_exact_subset(self):
+        """Exact subset is found among many candidates (beyond brute-force reach)."""
+        target_area = 10.0
+        exact = [3.0, 2.5, 2.0, 1.5, 1.0]  # sums to 10.0
+        noise = [0.37 + 0.11 * i for i in range(17)]
+        candidates = [(make_profile(area=a), a, 1.0) for a in exact + noise]
+
+        profiles, difference = _accumulate_profiles(candidates, target_area)
+
+        assert difference <= target_area * 0.00003
+        assert sum(c[1] for c in candidates if c[0] in profiles) == pytest.approx(10.0)
+        assert len(profiles) <= 15
+
+    def test_rejects_combinations_above_area_limit(self):
+        """Combinations larger than 1.01 * target are not considered."""
+        target_area = 10.0
+        profile1 = make_profile(area=6.0)
+        profile2 = make_profile(area=5.0)
+        candidates = [(profile1, 6.0, 1.0), (profile2, 5.0, 1.0)]
+
+        profiles, difference = _accumulate_profiles(candidates, target_area)
+
+        # 6.0 + 5.0 = 11.0 exceeds the limit, so the best is 6.0 alone
+        assert profiles == [profile1]
+        assert difference == pytest.approx(4.0)
+
+
+def make_body(min_xyz, max_xyz):
+    """Create a mock BRepBody with a bounding box and a pointContainment mock."""
+    body = MagicMock()
+    body.boundingBox.minPoint = SimpleNamespace(x=min_xyz[0], y=min_xyz[1], z=min_xyz[2])
+    body.boundingBox.maxPoint = SimpleNamespace(x=max_xyz[0], y=max_xyz[1], z=max_xyz[2])
+    return body
+
+
+class TestPointContainment:
+    """Test _point_containment bounding-box pre-check."""
+
+    def test_outside_bounds_skips_api_query(self):
+        """Points outside the bounding box are classified without pointContainment()."""
+        body = make_body((0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+        bounds = _body_bounds(body)
+
+        result = _point_containment(body, bounds, 0.5, 0.5, -0.01)
+
+        assert result == tm_geometry.adsk.fusion.PointContainment.PointOutsidePointContainment
+        body.pointContainment.assert_not_called()
+
+    def test_inside_bounds_queries_api(self):
+        """Points inside the bounding box are passed to pointContainment()."""
+        body = make_body((0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+        body.pointContainment.return_value = 'inside'
+        bounds = _body_bounds(body)
+
+        result = _point_containment(body, bounds, 0.5, 0.5, 0.01)
+
+        assert result == 'inside'
+        body.pointContainment.assert_called_once()
+
+    def test_scratch_point_is_reused(self):
+        """A scratch point is moved to the query location and passed through."""
+        body = make_body((0.0, 0.0, 0.0), (1.0, 1.0, 1.0))
+        scratch = MagicMock()
+        bounds = _body_bounds(body)
+
+        _point_containment(body, bounds, 0.25, 0.5, 0.75, scratch)
+
+        scratch.set.assert_called_once_with(0.25, 0.5, 0.75)
+        body.pointContainment.assert_called_once_with(scratch)
+
+
+def vec(x, y, z):
+    """Create a simple Point3D/Vector3D stand-in."""
+    return SimpleNamespace(x=x, y=y, z=z)
+
+
+XY_FRAME = (vec(0.0, 0.0, 0.0), vec(1.0, 0.0, 0.0), vec(0.0, 1.0, 0.0), vec(0.0, 0.0, 1.0))
+
+
+def make_sketch(token='xy-sketch', frame=XY_FRAME):
+    """Create a sketch mock whose transform yields the given (origin, x, y, z) frame."""
+    sketch = MagicMock()
+    sketch.entityToken = token
+    sketch.transform.getAsCoordinateSystem.return_value = frame
+    return sketch
+
+
+@pytest.fixture
+def empty_sketch_frames():
+    """Run a test with an empty sketch frame cache."""
+    tm_geometry.clear_sketch_frames()
+    yield
+    tm_geometry.clear_sketch_frames()
+
+
+@pytest.mark.usefixtures('empty_sketch_frames')
+class TestSketchFrame:
+    """Test the per-sketch coordinate frame cache."""
+
+    FRAME = (vec(10.0, 0.0, 5.0), vec(0.0, 1.0, 0.0), vec(0.0, 0.0, 1.0), vec(1.0, 0.0, 0.0))
+
+    def test_frame_is_read_once_per_sketch(self):
+        """Repeated lookups for one sketch reuse the cached frame."""
+        sketch = make_sketch('sketch-a', self.FRAME)
+        first = _get_sketch_frame(sketch)
+        second = _get_sketch_frame(sketch)
+        assert first == second
+        sketch.transform.getAsCoordinateSystem.assert_called_once()
+
+    def test_clear_forces_reread(self):
+        """clear_sketch_frames() drops cached frames."""
+        sketch = make_sketch('sketch-a', self.FRAME)
+        _get_sketch_frame(sketch)
+        tm_geometry.clear_sketch_frames()
+        _get_sketch_frame(sketch)
+        assert sketch.transform.getAsCoordinateSystem.call_count == 2
+
+    def test_sketch_to_world(self):
+        """Sketch (x, y) maps to origin + x * xAxis + y * yAxis."""
+        frame = _get_sketch_frame(make_sketch('sketch-b', self.FRAME))
+        assert _sketch_to_world(frame, 2.0, 3.0) == pytest.approx((10.0, 2.0, 8.0))
+
+
+class FakeFace:
+    """Stand-in for adsk.fusion.BRepFace with a fixed evaluator normal."""
+
+    def __init__(self, body, normal):
+        self.body = body
+        self.evaluator = SimpleNamespace(
+            getNormalAtPoint=lambda point: (True, SimpleNamespace(x=normal[0], y=normal[1], z=normal[2])))
+
+
+@pytest.fixture
+def brep_face_class(monkeypatch):
+    """Make FakeFace pass the isinstance(..., adsk.fusion.BRepFace) check."""
+    monkeypatch.setattr(tm_geometry.adsk.fusion, 'BRepFace', FakeFace)
+
+
+@pytest.mark.usefixtures('brep_face_class')
+class TestDirectionFromFace:
+    """Test _direction_from_face shortcut for sketches on a body face."""
+
+    def test_outward_normal_along_sketch_z_cuts_negative(self):
+        """Face normal pointing along +Z means the body is on the -Z side."""
+        body = object()
+        sketch = SimpleNamespace(referencePlane=FakeFace(body, (0.0, 0.0, 1.0)))
+        result = _direction_from_face(sketch, body, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+        assert result == tm_geometry.adsk.fusion.ExtentDirections.NegativeExtentDirection
+
+    def test_outward_normal_against_sketch_z_cuts_positive(self):
+        """Face normal pointing along -Z means the body is on the +Z side."""
+        body = object()
+        sketch = SimpleNamespace(referencePlane=FakeFace(body, (0.0, 0.0, -1.0)))
+        result = _direction_from_face(sketch, body, 0.0, 0.0, 0.0, 0.0, 0.0, 1.0)
+        assert result == tm_geometry.adsk.fusion.ExtentDirections.PositiveExtentDirection
+
+    def test_face_of_other_body_falls_back(self):
+        """A face on a different body gives no shortcut."""
+        sketch = SimpleNamespace(referencePlane=FakeFace(object(), (0.0, 0.0, 1.0)))
+        assert _direction_from_face(sketch, object(), 0.0, 0.0, 0.0, 0.0, 0.0, 1.0) is None
+
+    def test_construction_plane_falls_back(self):
+        """A non-face reference plane gives no shortcut."""
+        sketch = SimpleNamespace(referencePlane=object())
+        assert _direction_from_face(sketch, object(), 0.0, 0.0, 0.0, 0.0, 0.0, 1.0) is None
+
+
+class FakePoint:
+    """Mutable Point3D stand-in (supports the scratch-point set())."""
+
+    def __init__(self, x, y, z):
+        self.set(x, y, z)
+
+    def set(self, x, y, z):
+        self.x, self.y, self.z = x, y, z
+
+
+@pytest.mark.usefixtures('empty_sketch_frames', 'brep_face_class')
+class TestExtrudeDirectionOnFace:
+    """Test that the face shortcut is confirmed against body material."""
+
+    @pytest.fixture(autouse=True)
+    def scratch_points(self, monkeypatch):
+        monkeypatch.setattr(tm_geometry.adsk.core.Point3D, 'create', FakePoint)
+
+    def make_slab_body(self, inside_below):
+        """Slab body below the XY plane; points under it count as inside only if inside_below."""
+        containment = tm_geometry.adsk.fusion.PointContainment
+        body = MagicMock()
+        body.boundingBox.minPoint = vec(-5.0, -5.0, -1.0)
+        body.boundingBox.maxPoint = vec(5.0, 5.0, 0.0)
+        body.pointContainment.side_effect = lambda p: (
+            containment.PointInsidePointContainment if inside_below and p.z < 0
+            else containment.PointOutsidePointContainment)
+        return body
+
+    def direction(self, body):
+        sketch = make_sketch()
+        sketch.referencePlane = FakeFace(body, (0.0, 0.0, 1.0))
+        return tm_geometry.findExtrudeDirectionFromSketch(sketch, SimpleNamespace(x=0.0, y=0.0), body)
+
+    def test_material_under_face_uses_one_probe(self):
+        """A point on the face with material below is confirmed by a single probe."""
+        body = self.make_slab_body(inside_below=True)
+        assert self.direction(body) == tm_geometry.adsk.fusion.ExtentDirections.NegativeExtentDirection
+        assert body.pointContainment.call_count == 1
+
+    def test_no_material_under_face(self):
+        """A point on the face's plane but off the material finds no direction."""
+        assert self.direction(self.make_slab_body(inside_below=False)) is None
+
+
+def circle_edge(radius, center=(0.0, 0.0, 0.0), normal=(0.0, 0.0, 1.0), circular=True):
+    """Create a BRepEdge stand-in with circle geometry."""
+    curve_types = tm_geometry.adsk.core.Curve3DTypes
+    geometry = SimpleNamespace(
+        curveType=curve_types.Circle3DCurveType if circular else curve_types.Line3DCurveType,
+        radius=radius, center=vec(*center), normal=vec(*normal))
+    return SimpleNamespace(geometry=geometry)
+
+
+def feature_component(features_name, reject=()):
+    """
+    Create a component mock for chamfer/fillet creation tests.
+
+    features_name is the collection under component.features (e.g.
+    'chamferFeatures'). Its add() fails for edge sets containing an edge in
+    reject; accepted edge sets are appended to the returned added list.
+    """
+    component = MagicMock()
+    features = getattr(component.features, features_name)
+    added = []
+
+    def create_input(*args):
+        feature_input = MagicMock()
+        # Chamfers take the edges in createInput(), fillets in addConstantRadiusEdgeSet()
+        feature_input.edges = list(args[0]._items) if args else []
+        feature_input.addConstantRadiusEdgeSet.side_effect = (
+            lambda coll, value, tangent: feature_input.edges.extend(coll._items))
+        return feature_input
+
+    def add(feature_input):
+        if any(edge in reject for edge in feature_input.edges):
+            raise RuntimeError('feature failed')
+        added.append(list(feature_input.edges))
+        return MagicMock()
+
+    features.createInput.side_effect = create_input
+    features.add.side_effect = add
+    return component, added
+
+
+class TestSnapshotCircularEdges:
+    """Test snapshot_circular_edges one-pass edge read."""
+
+    def test_snapshot_keeps_circles_only(self):
+        """Non-circular edges are dropped; circles keep radius, normal and center."""
+        circle = circle_edge(0.2, center=(1.0, 2.0, 3.0))
+        line = circle_edge(0.2, circular=False)
+        circle.tempId, line.tempId = 1, 2
+        extrude = SimpleNamespace(sideFaces=[SimpleNamespace(edges=[circle, line])])
+
+        snapshot = snapshot_circular_edges(extrude, SimpleNamespace(edges=[]))
+
+        assert snapshot == [(circle, 0.2, 0.0, 0.0, 1.0, 1.0, 2.0, 3.0)]
+
+    def test_snapshot_radius_match(self):
+        """Snapshot entries are filtered by radius into (edge, normal, center) records."""
+        small = circle_edge(0.2)
+        large = circle_edge(0.3)
+        small.tempId, large.tempId = 1, 2
+        extrude = SimpleNamespace(sideFaces=[SimpleNamespace(edges=[small, large])])
+
+        snapshot = snapshot_circular_edges(extrude, SimpleNamespace(edges=[]))
+
+        assert [r[0] for r in tm_geometry._snapshot_circles(snapshot, 0.3, 0.001)] == [large]
+
+    def test_snapshot_prefilters_by_expected_radius(self):
+        """With expectedRadius, other circle sizes never enter the snapshot."""
+        small = circle_edge(0.2)
+        large = circle_edge(0.3)
+        small.tempId, large.tempId = 1, 2
+        extrude = SimpleNamespace(sideFaces=[SimpleNamespace(edges=[small, large])])
+
+        snapshot = snapshot_circular_edges(extrude, SimpleNamespace(edges=[]), 0.2)
+
+        assert [entry[0] for entry in snapshot] == [small]
+
+
+class TestHoleEdges:
+    """Test _hole_edges candidate lookup from the extrude's side faces."""
+
+    def test_collects_side_face_edges_once(self):
+        """Edges shared by several side faces are returned once."""
+        entry = SimpleNamespace(tempId=1)
+        bottom = SimpleNamespace(tempId=2)
+        extrude = SimpleNamespace(sideFaces=[
+            SimpleNamespace(edges=[entry, bottom]),
+            SimpleNamespace(edges=[bottom]),
+        ])
+        body = SimpleNamespace(edges=['should not be used'])
+
+        assert _hole_edges(extrude, body) == [entry, bottom]
+
+    def test_falls_back_to_body_edges(self):
+        """Without side faces, all body edges are returned."""
+        extrude = SimpleNamespace(sideFaces=[])
+        body = SimpleNamespace(edges=['e1', 'e2'])
+
+        assert _hole_edges(extrude, body) == ['e1', 'e2']
+
+
+class TestRayExtent:
+    """Test _ray_extent clipping of the through-hole search."""
+
+    BOX = (0.0, 0.0, 0.0, 10.0, 4.0, 2.0)
+
+    def test_axis_ray_from_face(self):
+        """A ray from the bottom face reaches the top face after the box height."""
+        assert _ray_extent(self.BOX, 5.0, 2.0, 0.0, 0.0, 0.0, 1.0) == pytest.approx(2.0)
+
+    def test_negative_axis_ray(self):
+        """Direction sign is respected."""
+        assert _ray_extent(self.BOX, 5.0, 2.0, 2.0, 0.0, 0.0, -1.0) == pytest.approx(2.0)
+
+    def test_box_behind_ray(self):
+        """A ray pointing away from the box gets no search range."""
+        assert _ray_extent(self.BOX, 5.0, 2.0, 3.0, 0.0, 0.0, 1.0) <= 0.0
+
+    def test_oblique_ray_bounds_farthest_corner(self):
+        """For a tilted ray the extent covers the farthest box corner."""
+        k = math.sqrt(0.5)
+        assert _ray_extent(self.BOX, 0.0, 0.0, 0.0, k, 0.0, k) == pytest.approx(12.0 * k)
+
+
+def slab(start, end):
+    """Return an isInsideAt callable for a body occupying [start, end] along the ray."""
+    return lambda d: start < d < end
+
+
+class TestFirstExit:
+    """Test the through-hole exit search helpers."""
+
+    def test_hits_body_starting_at_sketch_plane(self):
+        """Ray starting on the entry face exits at the first hit."""
+        assert _first_exit_from_hits([2.5], slab(0.0, 2.5)) == 2.5
+
+    def test_hits_body_after_gap(self):
+        """Outside span before the body is skipped."""
+        assert _first_exit_from_hits([3.0, 1.0], slab(1.0, 3.0)) == 3.0
+
+    def test_hits_first_exit_with_second_body_region(self):
+        """Only the first exit is returned when the ray re-enters the body."""
+        def two_walls(d):
+            return 0.0 < d < 1.0 or 2.0 < d < 4.0
+        assert _first_exit_from_hits([1.0, 2.0, 4.0], two_walls) == 1.0
+
+    def test_no_hits(self):
+        """No face hits means no exit."""
+        assert _first_exit_from_hits([], slab(0.0, 1.0)) is None
+
+    def test_search_finds_exit_within_tolerance(self):
+        """Stepping + bisection search brackets the exit within tolerance."""
+        result = _first_exit_by_search(slab(0.0, 3.7), 100.0, tolerance=0.01)
+        assert 3.7 <= result <= 3.71
+
+    def test_search_uses_few_probes(self):
+        """Search needs far fewer probes than a 0.1 cm linear walk."""
+        calls = []
+
+        def is_inside(d):
+            calls.append(d)
+            return 0.0 < d < 55.0
+
+        result = _first_exit_by_search(is_inside, 100.0)
+        assert 55.0 <= result <= 55.01
+        assert len(calls) < 30
+
+    def test_search_finds_thin_wall_after_gap(self):
+        """A wall between the doubling samples is still found."""
+        result = _first_exit_by_search(slab(0.45, 0.75), 100.0, tolerance=0.01)
+        assert 0.75 <= result <= 0.76
+
+    def test_search_stops_at_first_of_two_walls(self):
+        """The exit of the first wall wins over a later wall."""
+        def two_walls(d):
+            return 0.25 < d < 0.55 or 0.65 < d < 3.0
+        result = _first_exit_by_search(two_walls, 100.0, tolerance=0.01)
+        assert 0.55 <= result <= 0.56
+
+    def test_search_never_inside(self):
+        """Returns None when no sample is inside the body."""
+        assert _first_exit_by_search(lambda d: False, 100.0) is None
+
+
+class TestFlushPendingFillets:
+    """Test batched bottom fillet creation."""
+
+    def test_one_feature_per_radius(self):
+        """Edges sharing a radius go into a single fillet feature."""
+        component, added = feature_component('filletFeatures')
+        pending = {0.05: [('e1', 0.2), ('e2', 0.2), ('e3', 0.2)], 0.1: [('e4', 0.2)]}
+
+        features = flushPendingFillets(component, pending)
+
+        assert len(features) == 2
+        assert added == [['e1', 'e2', 'e3'], ['e4']]
+        assert pending == {}
+
+    def test_rejected_set_retries_edges_individually(self):
+        """A failing combined set falls back to one fillet per edge."""
+        component, added = feature_component('filletFeatures', reject={'bad'})
+        pending = {0.05: [('e1', 0.2), ('bad', 0.2), ('e2', 0.2)]}
+
+        features = flushPendingFillets(component, pending)
+
+        assert len(features) == 2
+        assert added == [['e1'], ['e2']]
+
+    def test_oversized_radius_skips_api(self):
+        """A fillet wider than the hole is never sent to Fusion."""
+        component, added = feature_component('filletFeatures')
+        pending = {0.05: [('small_hole', 0.05)]}
+
+        assert flushPendingFillets(component, pending) == []
+        component.features.filletFeatures.add.assert_not_called()
+
+
+class TestAddChamferToEdges:
+    """Test batched chamfer creation."""
+
+    def test_single_feature_for_all_edges(self):
+        """All edges go into one chamfer feature."""
+        component, added = feature_component('chamferFeatures')
+
+        features = addChamferToEdges(component, ['e1', 'e2', 'e3'], 0.5)
+
+        assert len(features) == 1
+        assert added == [['e1', 'e2', 'e3']]
+
+    def test_rejected_set_retries_edges_individually(self):
+        """One bad edge only costs its own hole the chamfer."""
+        component, added = feature_component('chamferFeatures', reject={'bad'})
+
+        features = addChamferToEdges(component, ['e1', 'bad', 'e2'], 0.5)
+
+        assert len(features) == 2
+        assert added == [['e1'], ['e2']]
+
+
+@pytest.mark.usefixtures('empty_sketch_frames')
+class TestHoleEdgeSelection:
+    """Test entrance/bottom edge choice from a snapshot of a blind hole."""
+
+    def snapshot(self):
+        """Hole of radius 0.2 at (1, 1): entrance at z=0, bottom at z=-0.6, plus a neighbour hole."""
+        return [
+            ('bottom', 0.2, 0.0, 0.0, 1.0, 1.0, 1.0, -0.6),
+            ('entrance', 0.2, 0.0, 0.0, 1.0, 1.0, 1.0, 0.0),
+            ('neighbour', 0.2, 0.0, 0.0, 1.0, 3.0, 1.0, -0.6),
+        ]
+
+    def test_chamfer_edge_is_closest_to_sketch_plane(self):
+        """The entrance edge is the on-axis circle nearest the sketch plane."""
+        center = SimpleNamespace(x=1.0, y=1.0)
+        edge = findChamferEdge(None, None, make_sketch(), center, 0.4, self.snapshot())
+        assert edge == 'entrance'
+
+    def test_bottom_edge_is_furthest_from_sketch_plane(self):
+        """The bottom edge is the on-axis circle furthest from the sketch plane."""
+        center = SimpleNamespace(x=1.0, y=1.0)
+        edge = findBottomEdge(None, None, make_sketch(), center, 0.4, self.snapshot())
+        assert edge == 'bottom'
+
+    def test_snapshot_taken_when_omitted(self):
+        """Without a snapshot, the extrude's side-face edges are read directly."""
+        bottom = circle_edge(0.2, center=(1.0, 1.0, -0.6))
+        entrance = circle_edge(0.2, center=(1.0, 1.0, 0.0))
+        bottom.tempId, entrance.tempId = 1, 2
+        extrude = SimpleNamespace(sideFaces=[SimpleNamespace(edges=[bottom, entrance])])
+        center = SimpleNamespace(x=1.0, y=1.0)
+        assert findBottomEdge(extrude, None, make_sketch(), center, 0.4) is bottom
+
+    def test_no_on_axis_circle(self):
+        """A point with no hole under it finds no edges."""
+        center = SimpleNamespace(x=5.0, y=5.0)
+        assert findBottomEdge(None, None, make_sketch(), center, 0.4, self.snapshot()) is None
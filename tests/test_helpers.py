@@ -4,7 +4,9 @@ Unit tests for tm_helpers.py functions.
 
 import pytest
 from types import SimpleNamespace
-from tm_helpers import isSamePoint, isSameCircle, calc_blind_hole_depth
+from unittest.mock import MagicMock
+import tm_helpers
+from tm_helpers import isSamePoint, isSameCircle, calc_blind_hole_depth, point_key, object_collection
 
 
 class TestIsSamePoint:
@@ -91,6 +93,50 @@ class TestIsSameCircle:
         assert isSameCircle(c1, c2, tol=1e-6) is True
 
 
+class TestPointKey:
+    """Test point_key grid keys."""
+
+    def test_equal_points_share_key(self):
+        """Identical points give identical keys."""
+        p1 = SimpleNamespace(x=1.0, y=-2.0, z=3.0)
+        p2 = SimpleNamespace(x=1.0, y=-2.0, z=3.0)
+        assert point_key(p1) == point_key(p2)
+
+    def test_points_within_tolerance_share_key(self):
+        """Points well inside one grid cell give identical keys."""
+        p1 = SimpleNamespace(x=1.0, y=2.0, z=3.0)
+        p2 = SimpleNamespace(x=1.0 + 1e-4, y=2.0, z=3.0)
+        assert point_key(p1, tol=0.01) == point_key(p2, tol=0.01)
+
+    def test_distinct_points_differ(self):
+        """Points further apart than tol give different keys."""
+        p1 = SimpleNamespace(x=1.0, y=2.0, z=3.0)
+        p2 = SimpleNamespace(x=1.0, y=2.0, z=3.1)
+        assert point_key(p1, tol=0.01) != point_key(p2, tol=0.01)
+
+    def test_dedup_with_set(self):
+        """Keys can be used to de-duplicate points with a set."""
+        points = [SimpleNamespace(x=x, y=0.0, z=0.0) for x in (0.0, 1.0, 0.0, 2.0, 1.0)]
+        assert len({point_key(p) for p in points}) == 3
+
+
+class TestObjectCollection:
+    """Test object_collection bulk construction."""
+
+    def test_builds_collection_from_list(self):
+        """Items end up in the collection in order."""
+        assert list(object_collection(['a', 'b', 'c'])) == ['a', 'b', 'c']
+
+    def test_accepts_generators(self):
+        """Any iterable is accepted."""
+        assert list(object_collection(x for x in (1, 2))) == [1, 2]
+
+    def test_falls_back_without_create_with_array(self, monkeypatch):
+        """Older APIs without createWithArray get create() + add()."""
+        monkeypatch.delattr(tm_helpers.adsk.core.ObjectCollection, 'createWithArray')
+        assert list(object_collection(['a', 'b'])) == ['a', 'b']
+
+
 class TestCalcBlindHoleDepth:
     """Test calc_blind_hole_depth function."""
 
@@ -123,3 +169,65 @@ class TestCalcBlindHoleDepth:
         """Custom extra depth: 5.0mm + 2.5mm = 7.5mm = 0.75cm."""
         result = calc_blind_hole_depth(5.0, 2.5)
         assert result == pytest.approx(0.75, abs=1e-9)
+
+
+class TestClearLog:
+    """Test clear_log palette writes."""
+
+    def test_disabled_logging_skips_palette(self, monkeypatch):
+        """With logging off the palette is never touched."""
+        palette = MagicMock()
+        monkeypatch.setattr(tm_helpers, '_palette', palette)
+        monkeypatch.setattr(tm_helpers, '_LOG_ENABLED', False)
+        tm_helpers.clear_log()
+        palette.writeText.assert_not_called()
+
+    def test_enabled_logging_writes_once(self, monkeypatch):
+        """With logging on the palette is cleared in a single write."""
+        palette = MagicMock()
+        monkeypatch.setattr(tm_helpers, '_palette', palette)
+        monkeypatch.setattr(tm_helpers, '_LOG_ENABLED', True)
+        tm_helpers.clear_log()
+        palette.writeText.assert_called_once()
+
+
+class TestLogLevels:
+    """Test log() level filtering and deferred formatting."""
+
+    @pytest.fixture
+    def palette(self, monkeypatch):
+        palette = MagicMock()
+        monkeypatch.setattr(tm_helpers, '_palette', palette)
+        monkeypatch.setattr(tm_helpers, '_LOG_ENABLED', True)
+        monkeypatch.setattr(tm_helpers, 'LOG_LEVEL', tm_helpers.INFO)
+        return palette
+
+    def test_info_message_written(self, palette, real_log):
+        """INFO messages are written at INFO level."""
+        real_log('hello')
+        palette.writeText.assert_called_once_with('hello')
+
+    def test_debug_message_dropped_at_info_level(self, palette, real_log):
+        """DEBUG messages are neither formatted nor written at INFO level."""
+        formatter = MagicMock(return_value='detail')
+        real_log(formatter, level=tm_helpers.DEBUG)
+        formatter.assert_not_called()
+        palette.writeText.assert_not_called()
+
+    def test_debug_message_written_at_debug_level(self, palette, real_log, monkeypatch):
+        """DEBUG messages are written once LOG_LEVEL is raised."""
+        monkeypatch.setattr(tm_helpers, 'LOG_LEVEL', tm_helpers.DEBUG)
+        real_log(lambda: 'detail', level=tm_helpers.DEBUG)
+        palette.writeText.assert_called_once_with('detail')
+
+    def test_percent_args_formatted(self, palette, real_log):
+        """A string message with args is %-formatted."""
+        real_log('r=%.2f', 1.2345)
+        palette.writeText.assert_called_once_with('r=1.23')
+
+    def test_disabled_logging_skips_formatting(self, palette, real_log, monkeypatch):
+        """Nothing is formatted while logging is off."""
+        monkeypatch.setattr(tm_helpers, '_LOG_ENABLED', False)
+        formatter = MagicMock(return_value='text')
+        real_log(formatter)
+        formatter.assert_not_called()
@@ -306,6 +306,30 @@ class TestSpecialCases:
         # Should handle gracefully (return None or empty collection)
         assert result is None or (hasattr(result, '__len__') and len(result) == 0)
 
+    def test_single_matching_profile_skips_accumulation(self, monkeypatch):
+        """A single profile matching the circle area is returned without combinatorial search."""
+        target_area = math.pi * (0.5 ** 2)
+        bore = make_profile_from_fixture_data({
+            'area_high_accuracy': target_area,
+            'centroid_high_xy': [0.0, 0.0],
+            'bbox': {'min_xy': [-0.5, -0.5], 'max_xy': [0.5, 0.5]},
+        })
+        sketch = MagicMock()
+        sketch.profiles = MockProfileCollection([bore])
+
+        target_circle = MagicMock()
+        target_circle.centerSketchPoint.geometry = make_point(0, 0)
+        target_circle.radius = 0.5
+        target_circle.area = target_area
+        target_circle.parentSketch = sketch
+
+        def fail_accumulate(*args, **kwargs):
+            raise AssertionError('_accumulate_profiles should not be called')
+
+        monkeypatch.setattr(tm_geometry, '_accumulate_profiles', fail_accumulate)
+
+        assert tm_geometry.findProfileForCircle(sketch, target_circle) is bore
+
 
 # ===== Helper Functions =====
 